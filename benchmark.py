@@ -0,0 +1,348 @@
+"""Local throughput benchmark for fuzzhound
+
+Starts stand-in HTTP and DNS servers on loopback, runs fuzzhound's endpoint and subdomain
+modes against them for each engine/worker combination, and prints one JSON report:
+
+    python3 benchmark.py --engines thread,async --threads 10,50 --concurrency 200 -o bench.json
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+from datetime import datetime, timezone
+
+import dns.message
+import dns.rcode
+import dns.rrset
+
+# Stand-in zone answered by the DNS responder; the HTTP stage reaches it over loopback
+BENCH_ZONE = "bench.test"
+
+# Address handed out for wildcard answers
+WILDCARD_IP = "127.0.0.2"
+
+NOT_FOUND_BODY = b"<html><body><h1>404 Not Found</h1></body></html>"
+
+def bucket(text):
+    """Stable value in [0, 1) for a path or name, so every run sees the same 404s and NXDOMAINs"""
+    return zlib.crc32(text.encode()) / 2**32
+
+class HTTPStandIn:
+    """Minimal asyncio HTTP/1.1 server with latency, page size, 404 share, keep-alive and 429 knobs"""
+
+    def __init__(self, latency=0.0, size=1024, not_found=0.9, keepalive=True, rate=0):
+        self.latency = latency
+        self.page = b"x" * size
+        self.not_found = not_found
+        self.keepalive = keepalive
+        self.rate = rate
+        self.tokens = rate
+        self.refilled = time.monotonic()
+
+    def _over_rate(self):
+        if not self.rate:
+            return False
+        now = time.monotonic()
+        self.tokens = min(self.rate, self.tokens + (now - self.refilled) * self.rate)
+        self.refilled = now
+        if self.tokens < 1:
+            return True
+        self.tokens -= 1
+        return False
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path = request_line.decode("latin-1").split()[:2]
+                length = 0
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    if name.strip().lower() == "content-length":
+                        length = int(value)
+                if length:
+                    await reader.readexactly(length)
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+
+                if self._over_rate():
+                    status, body, extra = "429 Too Many Requests", b"slow down", "Retry-After: 1\r\n"
+                elif bucket(path) < self.not_found:
+                    status, body, extra = "404 Not Found", NOT_FOUND_BODY, ""
+                else:
+                    status, body, extra = "200 OK", self.page, ""
+                connection = "keep-alive" if self.keepalive else "close"
+                writer.write(
+                    f"HTTP/1.1 {status}\r\nContent-Type: text/html\r\nContent-Length: {len(body)}\r\n"
+                    f"Connection: {connection}\r\n{extra}\r\n".encode("latin-1")
+                    + (b"" if method == "HEAD" else body)
+                )
+                await writer.drain()
+                if not self.keepalive:
+                    break
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+class DNSStandIn(asyncio.DatagramProtocol):
+    """UDP A-record responder for BENCH_ZONE with NXDOMAIN and wildcard shares"""
+
+    def __init__(self, nxdomain=0.8, wildcard=0.0):
+        self.nxdomain = nxdomain
+        self.wildcard = wildcard
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        try:
+            query = dns.message.from_wire(data)
+        except Exception:
+            return
+        response = dns.message.make_response(query)
+        name = query.question[0].name.to_text()
+        share = bucket(name)
+        # Wildcard answers come out of the NXDOMAIN share: names that do not exist but still resolve
+        if not name.rstrip(".").endswith(BENCH_ZONE):
+            response.set_rcode(dns.rcode.REFUSED)
+        elif share < self.nxdomain * self.wildcard:
+            response.answer.append(dns.rrset.from_text(name, 60, "IN", "A", WILDCARD_IP))
+        elif share < self.nxdomain:
+            response.set_rcode(dns.rcode.NXDOMAIN)
+        else:
+            # A distinct loopback address per host keeps real names apart from wildcard answers
+            host = zlib.crc32(name.encode(), 1) & 0xFFFF
+            response.answer.append(dns.rrset.from_text(name, 60, "IN", "A", f"127.1.{host >> 8}.{host & 0xFF}"))
+        self.transport.sendto(response.to_wire(), addr)
+
+def serve(settings, ports):
+    """Server process: run both stand-ins on one event loop and report their ports"""
+    async def start():
+        loop = asyncio.get_running_loop()
+        http = HTTPStandIn(settings["latency"], settings["size"], settings["not_found"],
+                           settings["keepalive"], settings["server_rate"])
+        server = await asyncio.start_server(http.handle, "127.0.0.1", 0, backlog=4096)
+        transport, _ = await loop.create_datagram_endpoint(
+            lambda: DNSStandIn(settings["nxdomain"], settings["wildcard"]), local_addr=("127.0.0.1", 0)
+        )
+        ports.send((server.sockets[0].getsockname()[1], transport.get_extra_info("sockname")[1]))
+        await server.serve_forever()
+
+    asyncio.run(start())
+
+def loopback_zone(getaddrinfo):
+    """getaddrinfo that sends BENCH_ZONE names to loopback, since system DNS has never heard of them"""
+    def resolve(host, *args, **kwargs):
+        if isinstance(host, str) and host.rstrip(".").endswith(BENCH_ZONE):
+            host = "127.0.0.1"
+        return getaddrinfo(host, *args, **kwargs)
+    return resolve
+
+def scan(argv, report):
+    """Scan process: run fuzzhound.main() on argv and send back request latencies and resource usage"""
+    socket.getaddrinfo = loopback_zone(socket.getaddrinfo)
+    import fuzzhound
+
+    latencies = []
+    observe = fuzzhound.Throttle._observe
+
+    def timed_observe(self, started, res, error):
+        latencies.append(time.monotonic() - started)
+        observe(self, started, res, error)
+
+    fuzzhound.Throttle._observe = timed_observe
+
+    lookups = []
+    resolve = fuzzhound.SubdomainResolver.resolve
+    resolve_async = fuzzhound.SubdomainResolver.resolve_async
+
+    def counted_resolve(self, name):
+        lookups.append(None)
+        return resolve(self, name)
+
+    async def counted_resolve_async(self, name):
+        lookups.append(None)
+        return await resolve_async(self, name)
+
+    fuzzhound.SubdomainResolver.resolve = counted_resolve
+    fuzzhound.SubdomainResolver.resolve_async = counted_resolve_async
+    sys.argv = ["fuzzhound.py"] + argv
+    sys.stdout = open(os.devnull, "w")
+
+    before = resource.getrusage(resource.RUSAGE_SELF)
+    started = time.perf_counter()
+    try:
+        fuzzhound.main()
+    except SystemExit:
+        pass
+    elapsed = time.perf_counter() - started
+    after = resource.getrusage(resource.RUSAGE_SELF)
+
+    report.send({
+        "elapsed": elapsed,
+        "latencies": latencies,
+        "dns_lookups": len(lookups),
+        "cpu": (after.ru_utime - before.ru_utime) + (after.ru_stime - before.ru_stime),
+        # ru_maxrss is KiB on Linux and bytes on macOS
+        "peak_rss_kb": after.ru_maxrss // (1024 if sys.platform == "darwin" else 1),
+    })
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))]
+
+def run_scenario(context, argv, output):
+    """Run one fuzzhound invocation in a fresh process and summarise it"""
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=scan, args=(argv, sender))
+    process.start()
+    sender.close()
+    stats = receiver.recv()
+    process.join()
+
+    found = 0
+    if os.path.exists(output):
+        with open(output, encoding="utf-8") as f:
+            found = sum(1 for line in f if line.strip())
+        os.remove(output)
+
+    latencies = sorted(stats["latencies"])
+    requests_sent = len(latencies)
+    return {
+        "requests": requests_sent,
+        "dns_lookups": stats["dns_lookups"],
+        "results": found,
+        "elapsed_s": round(stats["elapsed"], 3),
+        "req_per_s": round(requests_sent / stats["elapsed"], 1) if stats["elapsed"] else None,
+        "latency_ms": {
+            name: round(percentile(latencies, fraction) * 1000, 2) if latencies else None
+            for name, fraction in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99))
+        },
+        "peak_rss_kb": stats["peak_rss_kb"],
+        "cpu_ms_per_request": round(stats["cpu"] * 1000 / requests_sent, 3) if requests_sent else None,
+    }
+
+def repeated_wordlist(path, repeat, directory):
+    """Wordlist with every line of path repeated `repeat` times under a numbered prefix"""
+    if repeat <= 1:
+        return path
+    with open(path, encoding="utf-8", errors="ignore") as f:
+        words = [line.strip() for line in f if line.strip()]
+    target = os.path.join(directory, f"{repeat}x-{os.path.basename(path)}")
+    with open(target, "w", encoding="utf-8") as f:
+        for round_ in range(repeat):
+            f.writelines(f"{word}{round_ or ''}\n" for word in words)
+    return target
+
+def int_list(value):
+    """argparse type for comma-separated integers"""
+    try:
+        return [int(item) for item in value.split(",") if item.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma-separated integers, got '{value}'")
+
+def git_revision(here):
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=here, capture_output=True,
+                              text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def main():
+    here = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Benchmark fuzzhound against local stand-in HTTP and DNS servers")
+
+    scan_group = parser.add_argument_group("Scenarios")
+    scan_group.add_argument("--modes", help="Modes to run: fuzz, subdomains or both (default=fuzz,subdomains)", default="fuzz,subdomains")
+    scan_group.add_argument("--engines", help="Engines to compare (default=thread,async)", default="thread,async")
+    scan_group.add_argument("--threads", help="Thread counts for --engine thread (default=10,50)", type=int_list, default=[10, 50])
+    scan_group.add_argument("--concurrency", help="In-flight requests for --engine async (default=100,500)", type=int_list, default=[100, 500])
+    scan_group.add_argument("--wordlist", help="Endpoint wordlist (default=directories.txt)", default=os.path.join(here, "directories.txt"))
+    scan_group.add_argument("--subdomain-wordlist", help="Subdomain wordlist (default=subdomains.txt)", default=os.path.join(here, "subdomains.txt"))
+    scan_group.add_argument("--repeat", help="Repeat each wordlist this many times for longer runs (default=1)", type=int, default=1)
+    scan_group.add_argument("--extra", help="Extra fuzzhound options for every run, e.g. '--status-probe head'", default="")
+
+    server_group = parser.add_argument_group("Stand-in servers")
+    server_group.add_argument("--latency", help="Server think time per response in milliseconds (default=0)", type=float, default=0)
+    server_group.add_argument("--size", help="Body size of 200 responses in bytes (default=1024)", type=int, default=1024)
+    server_group.add_argument("--not-found", help="Share of paths answered with 404 (default=0.9)", type=float, default=0.9)
+    server_group.add_argument("--no-keepalive", help="Close the connection after every response", action="store_true")
+    server_group.add_argument("--server-rate", help="Answer 429 with Retry-After above this many req/s (default=unlimited)", type=float, default=0)
+    server_group.add_argument("--nxdomain", help="Share of names answered with NXDOMAIN (default=0.8)", type=float, default=0.8)
+    server_group.add_argument("--wildcard", help="Share of nonexistent names that resolve to a catch-all address instead; fuzzhound's random probe labels hit it at the same rate (default=0)", type=float, default=0.0)
+
+    parser.add_argument("-o", "--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    settings = {
+        "latency": args.latency / 1000, "size": args.size, "not_found": args.not_found,
+        "keepalive": not args.no_keepalive, "server_rate": args.server_rate,
+        "nxdomain": args.nxdomain, "wildcard": args.wildcard,
+    }
+    context = multiprocessing.get_context("spawn")
+    receiver, sender = context.Pipe(duplex=False)
+    server = context.Process(target=serve, args=(settings, sender), daemon=True)
+    server.start()
+    http_port, dns_port = receiver.recv()
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "revision": git_revision(here),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "servers": dict(settings, latency_ms=args.latency),
+        "runs": [],
+    }
+
+    with tempfile.TemporaryDirectory() as scratch:
+        wordlist = repeated_wordlist(args.wordlist, args.repeat, scratch)
+        subdomain_wordlist = repeated_wordlist(args.subdomain_wordlist, args.repeat, scratch)
+        modes = {
+            "fuzz": ["-u", f"http://127.0.0.1:{http_port}/FUZZ", "-w", wordlist],
+            "subdomains": ["-d", f"{BENCH_ZONE}:{http_port}", "--subdomain-wordlist", subdomain_wordlist,
+                           "--resolvers", f"127.0.0.1:{dns_port}", "--no-https"],
+        }
+        workers = {"thread": ("-t", args.threads), "async": ("--concurrency", args.concurrency)}
+
+        for mode in (m.strip() for m in args.modes.split(",") if m.strip()):
+            for engine in (e.strip() for e in args.engines.split(",") if e.strip()):
+                option, counts = workers[engine]
+                for count in counts:
+                    output = os.path.join(scratch, "results.jsonl")
+                    argv = modes[mode] + ["--engine", engine, option, str(count), "-o", output] + args.extra.split()
+                    print(f"[bench] {mode} / {engine} / {option} {count} ...", file=sys.stderr, flush=True)
+                    run = {"mode": mode, "engine": engine, "workers": count}
+                    run.update(run_scenario(context, argv, output))
+                    print(f"[bench]   {run['req_per_s']} req/s, p99 {run['latency_ms']['p99']} ms", file=sys.stderr, flush=True)
+                    report["runs"].append(run)
+
+    server.terminate()
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(f"[bench] Report saved to: {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
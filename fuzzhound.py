@@ -3,14 +3,73 @@ import sys
 import requests
 import time
 import json
+import os
+import csv
+import textwrap
+import hashlib
+import base64
 import threading
 import re
-from queue import Queue
-from colorama import Fore, Style, init
+from collections import deque
+from queue import Empty, Queue
 import itertools
-import dns.resolver
+import heapq
+import bisect
+import math
+import mmap
+import struct
+from array import array
+import random
+import string
+import asyncio
+import multiprocessing
+import ssl
+import socket
+import signal
+import zlib
+import codecs
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from urllib.parse import quote, quote_plus, urljoin, urlsplit
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Optional, Sequence, Union
+from email.utils import parsedate_to_datetime
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError
+from urllib3.poolmanager import PoolManager
+from urllib3.util.retry import Retry
+
+class LazyColors:
+    """Stand-in for colorama's Fore or Style: empty strings until enable_colors() is called
+
+    Only the CLI turns colours on, so a Scanner run formats its unprinted status lines without
+    importing colorama or wrapping sys.stdout.
+    """
+
+    enabled = False
+
+    def __init__(self, name):
+        self.name = name
+
+    def __getattr__(self, attr):
+        if not LazyColors.enabled:
+            return ""
+        import colorama
+        value = getattr(getattr(colorama, self.name), attr)
+        setattr(self, attr, value)
+        return value
+
+def enable_colors():
+    """Set up colorama for this console and let Fore and Style resolve to its codes"""
+    import colorama
+    colorama.init(autoreset=True)
+    LazyColors.enabled = True
+
+Fore = LazyColors("Fore")
+Style = LazyColors("Style")
 
-init(autoreset=True)
 # Default threads = 10
 THREADS = 10
 
@@ -35,345 +94,3777 @@ DEFAULT_SUBDOMAINS = [
     'watch', 'wordpress', 'works', 'xml', 'xmpp'
 ]
 
-def display_banner():
-    banner = f"""
-{Fore.YELLOW}
-███████╗██╗   ██╗███████╗███████╗██╗  ██╗ ██████╗ ██╗   ██╗███╗   ██╗██████╗ 
-██╔════╝██║   ██║╚══███╔╝╚══███╔╝██║  ██║██╔═══██╗██║   ██║████╗  ██║██╔══██╗
-█████╗  ██║   ██║  ███╔╝   ███╔╝ ███████║██║   ██║██║   ██║██╔██╗ ██║██║  ██║
-██╔══╝  ██║   ██║ ███╔╝   ███╔╝  ██╔══██║██║   ██║██║   ██║██║╚██╗██║██║  ██║
-██║     ╚██████╔╝███████╗███████╗██║  ██║╚██████╔╝╚██████╔╝██║ ╚████║██████╔╝
-╚═╝      ╚═════╝ ╚══════╝╚══════╝╚═╝  ╚═╝ ╚═════╝  ╚═════╝ ╚═╝  ╚═══╝╚═════╝ 
-  {Style.BRIGHT}                                                                                                                                                                                                                                          
-   / \\__
-   (    @\\___   
-   /         O   {Style.BRIGHT}{Fore.YELLOW}Sniffing out API endpoints & Subdomains {Fore.YELLOW}  
-  /   (_____/    {Style.BRIGHT}{Fore.YELLOW}by: @physx {Fore.YELLOW}            
- /_____/   U	
+def display_banner():
+    banner = f"""
+{Fore.YELLOW}
+███████╗██╗   ██╗███████╗███████╗██╗  ██╗ ██████╗ ██╗   ██╗███╗   ██╗██████╗ 
+██╔════╝██║   ██║╚══███╔╝╚══███╔╝██║  ██║██╔═══██╗██║   ██║████╗  ██║██╔══██╗
+█████╗  ██║   ██║  ███╔╝   ███╔╝ ███████║██║   ██║██║   ██║██╔██╗ ██║██║  ██║
+██╔══╝  ██║   ██║ ███╔╝   ███╔╝  ██╔══██║██║   ██║██║   ██║██║╚██╗██║██║  ██║
+██║     ╚██████╔╝███████╗███████╗██║  ██║╚██████╔╝╚██████╔╝██║ ╚████║██████╔╝
+╚═╝      ╚═════╝ ╚══════╝╚══════╝╚═╝  ╚═╝ ╚═════╝  ╚═════╝ ╚═╝  ╚═══╝╚═════╝ 
+  {Style.BRIGHT}                                                                                                                                                                                                                                          
+   / \\__
+   (    @\\___   
+   /         O   {Style.BRIGHT}{Fore.YELLOW}Sniffing out API endpoints & Subdomains {Fore.YELLOW}  
+  /   (_____/    {Style.BRIGHT}{Fore.YELLOW}by: @physx {Fore.YELLOW}            
+ /_____/   U	
+
+{Style.RESET_ALL}
+    """
+    print(banner)
+
+# Marks the end of the payload stream for queue-fed workers
+END_OF_PAYLOADS = object()
+
+# Payloads buffered per worker thread; keeps producer memory flat for any keyspace
+QUEUE_DEPTH_PER_WORKER = 4
+
+class ScanError(Exception):
+    """A scan cannot start: conflicting options, or an unreadable wordlist, targets or checkpoint file"""
+
+class Cancellation(threading.Event):
+    """Set by Scanner.cancel(): producers stop handing out payloads and in-flight requests finish"""
+
+    def __reduce__(self):
+        # --processes children get their own; the parent stops them with SIGINT
+        return (Cancellation, ())
+
+def load_wordlists(wordlist_args, results):
+    """Load multiple wordlists; combinations are generated lazily by iter_combinations"""
+    wordlists = []
+    wordlist_files = wordlist_args.split(',')
+    
+    for i, wordlist_file in enumerate(wordlist_files):
+        try:
+            if is_compiled(wordlist_file.strip()):
+                words = CompiledWordlist(wordlist_file.strip())
+            else:
+                with open(wordlist_file.strip(), "r", encoding="utf-8", errors="ignore") as f:
+                    words = [line.strip() for line in f if line.strip()]
+            wordlists.append(words)
+            kind = ", compiled" if isinstance(words, CompiledWordlist) else ""
+            results.note(Fore.GREEN + f"[+] Loaded wordlist {i+1}: {wordlist_file.strip()} ({len(words)} words{kind})")
+        except FileNotFoundError:
+            raise ScanError(f"Wordlist file '{wordlist_file}' not found")
+        except Exception as e:
+            raise ScanError(f"cannot read wordlist '{wordlist_file}': {e}")
+    
+    return wordlists
+
+def iter_combinations(wordlists, mode="clusterbomb", start=0):
+    """Lazily yield payload tuples: every combination (clusterbomb) or line-by-line (pitchfork), from index `start`"""
+    if mode == "pitchfork":
+        return zip(*(iter_from(words, start) for words in wordlists))
+    if any(isinstance(words, CompiledWordlist) for words in wordlists):
+        # itertools.product would copy every mapped list into a tuple; index them in place instead
+        return indexed_product(wordlists, start)
+    if not start:
+        return itertools.product(*wordlists)
+    return product_from(wordlists, start)
+
+def product_from(wordlists, start):
+    """itertools.product(*wordlists) starting at index `start`, without generating the skipped prefix"""
+    if not wordlists:
+        yield ()
+        return
+    head, rest = wordlists[0], wordlists[1:]
+    row, offset = divmod(start, math.prod(len(words) for words in rest))
+    if row >= len(head):
+        return
+    # Finish the partial row, then hand the untouched remainder back to itertools
+    for tail in product_from(rest, offset):
+        yield (head[row],) + tail
+    yield from itertools.product(head[row + 1:], *rest)
+
+def indexed_product(wordlists, start=0):
+    """itertools.product(*wordlists) from index `start`, looking each word up by position instead of copying the lists"""
+    sizes = [len(words) for words in wordlists]
+    for index in range(start, math.prod(sizes)):
+        combination = []
+        for words, size in zip(reversed(wordlists), reversed(sizes)):
+            index, position = divmod(index, size)
+            combination.append(words[position])
+        combination.reverse()
+        yield tuple(combination)
+
+def count_combinations(wordlists, mode="clusterbomb"):
+    """Number of payloads iter_combinations will yield, without generating them"""
+    if mode == "pitchfork":
+        return min(len(words) for words in wordlists)
+    return math.prod(len(words) for words in wordlists)
+
+def iter_lines(f):
+    """Yield stripped, non-empty lines from an open file"""
+    for line in f:
+        line = line.strip()
+        if line:
+            yield line
+
+def load_targets(path):
+    """Read a --targets-file: one URL or domain per line; URLs may be followed by a scheduling weight"""
+    targets = {}
+    weighted = None  # first line that carried a weight
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        for number, line in enumerate(f, 1):
+            parts = line.split()
+            if not parts or parts[0].startswith("#"):
+                continue
+            if len(parts) > 2 or (len(parts) == 2 and not (parts[1].isdigit() and int(parts[1]) > 0)):
+                raise ValueError(f"{path}:{number}: expected '<url or domain> [weight]'")
+            targets.setdefault(parts[0], int(parts[1]) if len(parts) == 2 else 1)
+            if len(parts) == 2 and weighted is None:
+                weighted = number
+    if not targets:
+        raise ValueError(f"no targets in '{path}'")
+    urls = sum("://" in target for target in targets)
+    if urls not in (0, len(targets)):
+        raise ValueError(f"'{path}' mixes URLs (endpoint fuzzing) with bare domains (subdomain enumeration)")
+    if not urls and weighted is not None:
+        raise ValueError(f"{path}:{weighted}: weights only apply to URLs; domains share each wordlist pass equally")
+    return list(targets.items())
+
+def iter_wordlist(path, start=0):
+    """Stream a single wordlist file without loading it into memory, from line index `start`"""
+    if is_compiled(path):
+        # Reopened per call, so each pass (e.g. --recursion-depth) holds its own mapping
+        words = CompiledWordlist(path)
+        try:
+            yield from words.iter_from(start)
+        finally:
+            words.close()
+        return
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        yield from itertools.islice(iter_lines(f), start, None)
+
+def iter_from(words, start):
+    """Iterate a loaded or compiled wordlist from index `start`"""
+    if isinstance(words, CompiledWordlist):
+        return words.iter_from(start)
+    return itertools.islice(words, start, None)
+
+def count_lines(path):
+    """Count the payloads iter_wordlist yields from a file; compiled wordlists store their word count"""
+    if is_compiled(path):
+        with open(path, "rb") as f:
+            return WORDLIST_HEADER.unpack(f.read(WORDLIST_HEADER.size))[1]
+    # Counted with the same reader as the scan, so skipped blank lines can't push totals, shard
+    # bounds or resume offsets past the payloads that actually exist
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        return sum(1 for _ in iter_lines(f))
+
+# Compiled wordlist layout (little-endian): header, the words as newline-terminated UTF-8, then count + 1
+# u64 file offsets so word i is file[offsets[i]:offsets[i + 1] - 1]. The digest covers the words only.
+WORDLIST_MAGIC = b"FHWLIST1"
+WORDLIST_HEADER = struct.Struct("<8sQQ32s")
+WORDLIST_SUFFIX = ".fhw"
+
+def is_compiled(path):
+    """True if `path` is a wordlist built by `fuzzhound.py compile`"""
+    with open(path, "rb") as f:
+        return f.read(len(WORDLIST_MAGIC)) == WORDLIST_MAGIC
+
+def compile_wordlist(source, output):
+    """Write `source` as a compiled wordlist: stripped, non-empty, first occurrence kept; returns (words, duplicates)"""
+    # Duplicates are found through an open-addressing table of word indexes keyed by hash, and every
+    # hash hit is confirmed against the bytes already written, so memory stays at a few machine words
+    # per distinct word and a collision can never drop a word
+    hashes = array("Q")
+    table = array("Q", bytes(8 * 1024))
+    mask = len(table) - 1
+    duplicates = 0
+    digest = hashlib.blake2b(digest_size=32)
+    position = WORDLIST_HEADER.size
+    offsets = array("Q", [position])
+    pending = bytearray()
+    pending_at = position
+    temp = output + ".tmp"
+
+    def stored(index):
+        start, end = offsets[index], offsets[index + 1]
+        if start >= pending_at:
+            return pending[start - pending_at:end - pending_at]
+        return os.pread(out.fileno(), end - start, start)
+
+    try:
+        with open(source, "r", encoding="utf-8", errors="ignore") as f, open(temp, "w+b") as out:
+            out.write(bytes(WORDLIST_HEADER.size))
+            out.flush()
+            for word in iter_lines(f):
+                data = word.encode() + b"\n"
+                key = hash(data) & 0xFFFFFFFFFFFFFFFF
+                slot = key & mask
+                while table[slot]:
+                    index = table[slot] - 1
+                    if hashes[index] == key and stored(index) == data:
+                        duplicates += 1
+                        break
+                    slot = (slot + 1) & mask
+                else:
+                    table[slot] = len(hashes) + 1
+                    hashes.append(key)
+                    pending += data
+                    digest.update(data)
+                    position += len(data)
+                    offsets.append(position)
+                    if len(pending) >= 1 << 20:
+                        out.write(pending)
+                        out.flush()
+                        pending.clear()
+                        pending_at = position
+                    if len(hashes) * 2 > len(table):
+                        table = array("Q", bytes(16 * len(table)))
+                        mask = len(table) - 1
+                        for index, key in enumerate(hashes):
+                            slot = key & mask
+                            while table[slot]:
+                                slot = (slot + 1) & mask
+                            table[slot] = index + 1
+            out.write(pending)
+            del table, hashes
+            if sys.byteorder == "big":
+                offsets.byteswap()
+            out.write(offsets.tobytes())
+            out.seek(0)
+            out.write(WORDLIST_HEADER.pack(WORDLIST_MAGIC, len(offsets) - 1, position, digest.digest()))
+        os.replace(temp, output)
+    except BaseException:
+        if os.path.exists(temp):
+            os.remove(temp)
+        raise
+    return len(offsets) - 1, duplicates
+
+class CompiledWordlist:
+    """Read-only, memory-mapped view of a compiled wordlist
+
+    Behaves like a list of str for len(), indexing and iteration, but words are only decoded
+    when asked for, so opening a 50M-word list costs no more than opening a small one and
+    every process or shard reading it shares the same page cache.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, offsets_at, self.digest = WORDLIST_HEADER.unpack_from(self.map)
+        if magic != WORDLIST_MAGIC or offsets_at + (self.count + 1) * 8 != len(self.map):
+            self.map.close()
+            raise ValueError(f"'{path}' is not a valid compiled wordlist; rebuild it with 'fuzzhound.py compile'")
+        view = memoryview(self.map)[offsets_at:]
+        if sys.byteorder == "big":
+            self.offsets = array("Q", view)
+            self.offsets.byteswap()
+            view.release()
+        else:
+            self.offsets = view.cast("Q")
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.count))]
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("wordlist index out of range")
+        return self.map[self.offsets[index]:self.offsets[index + 1] - 1].decode()
+
+    def __contains__(self, word):
+        # Words are newline-terminated and never contain one, so a match preceded by a newline is a whole word
+        needle = word.encode() + b"\n"
+        begin, end = self.offsets[0], self.offsets[self.count]
+        at = self.map.find(needle, begin, end)
+        while at != -1:
+            if at == begin or self.map[at - 1] == 10:
+                return True
+            at = self.map.find(needle, at + 1, end)
+        return False
+
+    def __iter__(self):
+        return self.iter_from(0)
+
+    def iter_from(self, start):
+        """Yield words from index `start` onwards; seeking is O(1)"""
+        offsets, data = self.offsets, self.map
+        for index in range(start, self.count):
+            yield data[offsets[index]:offsets[index + 1] - 1].decode()
+
+    def close(self):
+        if isinstance(self.offsets, memoryview):
+            self.offsets.release()
+        self.map.close()
+
+def compile_main(argv):
+    """`fuzzhound.py compile SOURCE [-o OUTPUT]`: build a compiled wordlist once for reuse by every run"""
+    parser = argparse.ArgumentParser(prog="fuzzhound.py compile", description="Compile a wordlist into a deduplicated, memory-mapped file accepted wherever -w or --subdomain-wordlist takes a path")
+    parser.add_argument("source", help="Plain-text wordlist, one word per line")
+    parser.add_argument("-o", "--output", help=f"Compiled wordlist to write (default: SOURCE{WORDLIST_SUFFIX})")
+    args = parser.parse_args(argv)
+    output = args.output or args.source + WORDLIST_SUFFIX
+
+    started = time.monotonic()
+    try:
+        count, duplicates = compile_wordlist(args.source, output)
+    except FileNotFoundError:
+        print(Fore.RED + f"[-] Error: Wordlist file '{args.source}' not found")
+        sys.exit(1)
+    except OSError as e:
+        print(Fore.RED + f"[-] Error compiling wordlist: {e}")
+        sys.exit(1)
+    print(Fore.GREEN + f"[+] Compiled {count} words into {output} ({duplicates} duplicates dropped) in {format_duration(time.monotonic() - started)}")
+
+def parse_shard(value):
+    """argparse type for --shard i/n; returns a zero-based (index, count) pair"""
+    match = re.fullmatch(r"\s*(\d+)\s*/\s*(\d+)\s*", value)
+    if not match or not 1 <= int(match.group(1)) <= int(match.group(2)):
+        raise argparse.ArgumentTypeError(f"invalid shard '{value}' (expected i/n with 1 <= i <= n, e.g. 3/8)")
+    return int(match.group(1)) - 1, int(match.group(2))
+
+def shard_bounds(total, shards):
+    """Index range [start, end) owned by a run after applying each (index, count) split in turn"""
+    start, end = 0, total
+    for index, count in shards:
+        size = end - start
+        start, end = start + size * index // count, start + size * (index + 1) // count
+    return start, end
+
+def run_thread_pool(worker, payloads, args, *worker_args):
+    """Start worker threads, then feed them payloads through a bounded queue"""
+    queue = Queue(maxsize=args.threads * QUEUE_DEPTH_PER_WORKER)
+
+    threads = []
+    for _ in range(args.threads):
+        t = threading.Thread(target=worker, args=(queue, args) + worker_args)
+        t.daemon = True
+        t.start()
+        threads.append(t)
+
+    # Producer: blocks whenever the workers fall behind
+    for payload in payloads:
+        if args.cancel.is_set():
+            break
+        queue.put(payload)
+    for _ in threads:
+        queue.put(END_OF_PAYLOADS)
+
+    queue.join()
+
+# Seconds between forced flushes of the result file
+FLUSH_INTERVAL = 1.0
+
+# Queue items the writer thread handles per write() call
+WRITE_BATCH = 512
+
+FUZZ_FIELDS = ["payload", "url", "status", "size", "data_sent", "final_url", "redirect_chain", "fingerprint", "duplicates", "target"]
+SUBDOMAIN_FIELDS = ["subdomain", "method", "ip_addresses", "url", "status", "size", "final_url", "redirect_chain", "fingerprint", "duplicates", "target"]
+
+def output_format(args):
+    """Pick the result file format from --output-format or the -o extension"""
+    if args.output_format:
+        return args.output_format
+    extension = os.path.splitext(args.output or "")[1].lower()
+    return {".jsonl": "jsonl", ".ndjson": "jsonl", ".csv": "csv"}.get(extension, "json")
+
+class ResultSink:
+    """Single writer thread for terminal lines and result records; workers only enqueue
+
+    With terminal=False nothing is printed; on_record, if given, is called from the writer
+    thread with every record after it has been written (Scanner streams results this way).
+    """
+
+    def __init__(self, output=None, fmt="json", fields=(), append=False, terminal=True, on_record=None):
+        self.output = output
+        self.format = fmt
+        self.count = 0
+        self.queue = Queue()
+        self.file = None
+        self.csv = None
+        if output:
+            # Pretty JSON is assembled at the end from a JSONL journal, so a crash keeps what was found
+            self.path = output + ".partial.jsonl" if fmt == "json" else output
+            if append and fmt == "json":
+                self._reopen_journal()
+            fresh = not (append and os.path.exists(self.path) and os.path.getsize(self.path))
+            self.file = open(self.path, "w" if fresh else "a", encoding="utf-8", newline="" if fmt == "csv" else None)
+            if fmt == "csv":
+                self.csv = csv.DictWriter(self.file, fieldnames=fields, extrasaction="ignore")
+                if fresh:
+                    self.csv.writeheader()
+        self.status = None
+        self.terminal = terminal
+        self.on_record = on_record
+        self.last_flush = time.monotonic()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def append(self, record):
+        self.queue.put(("record", record))
+
+    def append_summary(self, record):
+        """Write a record that annotates earlier results (e.g. a --collapse group count) without counting as one"""
+        self.queue.put(("summary", record))
+
+    def echo(self, line):
+        self.queue.put(("line", line))
+
+    def note(self, line):
+        """Setup or summary line; unlike echo, --processes children drop these"""
+        self.echo(line)
+
+    def progress(self, line):
+        """Replace the status line kept under the output; None removes it"""
+        self.queue.put(("progress", line))
+
+    def __len__(self):
+        return self.count
+
+    def drain(self):
+        """Block until everything queued so far has been written"""
+        self.queue.join()
+
+    def _run(self):
+        running = True
+        while running:
+            try:
+                batch = [self.queue.get(timeout=FLUSH_INTERVAL)]
+            except Empty:
+                self._flush()
+                continue
+            while len(batch) < WRITE_BATCH:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except Empty:
+                    break
+
+            lines = []
+            status = self.status
+            for kind, value in batch:
+                if kind == "line":
+                    lines.append(value + Style.RESET_ALL)
+                elif kind in ("record", "summary"):
+                    self.count += kind == "record"
+                    self._write(value)
+                    if self.on_record:
+                        self.on_record(value)
+                elif kind == "progress":
+                    status = value
+                else:
+                    running = False
+            if self.terminal and (lines or status != self.status):
+                # Clear the status line, print above it, then draw it again
+                out = "\r\033[K" if self.status else ""
+                if lines:
+                    out += "\n".join(lines) + "\n"
+                if status:
+                    out += Fore.CYAN + status + Style.RESET_ALL
+                self.status = status
+                try:
+                    sys.stdout.write(out)
+                    sys.stdout.flush()
+                except OSError:
+                    # stdout went away (e.g. piped into head); keep writing the result file
+                    self.terminal = False
+            if time.monotonic() - self.last_flush >= FLUSH_INTERVAL:
+                self._flush()
+            for _ in batch:
+                self.queue.task_done()
+
+    def _reopen_journal(self):
+        """Turn a finished JSON result file back into a journal so a resumed run can append to it"""
+        if os.path.exists(self.path) or not os.path.exists(self.output):
+            return
+        with open(self.output, encoding="utf-8") as f:
+            records = json.load(f)
+        with open(self.path, "w", encoding="utf-8") as journal:
+            for record in records:
+                journal.write(json.dumps(record) + "\n")
+
+    def _write(self, record):
+        if self.csv:
+            self.csv.writerow({
+                key: json.dumps(value) if isinstance(value, (list, dict)) else value
+                for key, value in record.items()
+            })
+        elif self.file:
+            self.file.write(json.dumps(record) + "\n")
+
+    def _flush(self):
+        if self.file:
+            self.file.flush()
+        self.last_flush = time.monotonic()
+
+    def close(self):
+        """Stop the writer and finish the result file; returns its path, or None if nothing was saved"""
+        self.queue.put(("end", None))
+        self.thread.join()
+        if not self.file:
+            return None
+        self.file.close()
+        if self.format != "json":
+            return self.output
+        if not os.path.getsize(self.path):
+            os.remove(self.path)
+            return None
+        with open(self.path, encoding="utf-8") as journal, open(self.output, "w", encoding="utf-8") as f:
+            f.write("[\n")
+            for i, line in enumerate(journal):
+                f.write((",\n" if i else "") + textwrap.indent(json.dumps(json.loads(line), indent=2), "  "))
+            f.write("\n]")
+        os.remove(self.path)
+        return self.output
+
+
+# Seconds between checkpoint writes
+CHECKPOINT_INTERVAL = 5.0
+
+# Options that change which requests are sent or what gets recorded; a checkpoint only resumes a matching run
+CHECKPOINT_OPTIONS = (
+    "target", "domain", "method", "headers", "data", "no_encode", "mode", "extra_subdomains", "skip_dns",
+    "dedup_ip", "probe_unresolved", "scheme_policy", "no_https", "force_https",
+    "filter_status", "filter_size", "filter_content", "exclude_content", "max_body", "status_probe", "shards",
+    "auto_calibrate", "collapse", "targets",
+)
+
+def file_digest(path):
+    """SHA-256 of a file's contents, read in 1 MiB chunks; compiled wordlists use their stored digest"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        header = f.read(WORDLIST_HEADER.size)
+        if header.startswith(WORDLIST_MAGIC) and len(header) == WORDLIST_HEADER.size:
+            return WORDLIST_HEADER.unpack(header)[3].hex()
+        f.seek(0)
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def scan_fingerprint(args, wordlist_paths):
+    """Hash of the target, wordlist contents and request-shaping options"""
+    state = {name: getattr(args, name, None) for name in CHECKPOINT_OPTIONS}
+    state["wordlists"] = [file_digest(path) for path in wordlist_paths]
+    return hashlib.sha256(json.dumps(state, sort_keys=True).encode()).hexdigest()
+
+class Checkpoint:
+    """Completed payload indices for --checkpoint/--resume
+
+    Everything below `completed` is done; indices finished out of order above it are kept
+    in a small set and saved as a bitmap relative to `completed`. Without a path nothing is
+    saved and done() only counts, whatever order indices arrive in, so workers can call it
+    unconditionally and progress costs no memory (batch mode interleaves hosts finishing
+    at different speeds).
+    """
+
+    def __init__(self, path=None, fingerprint=None, start=0, end=None):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.start = start
+        self.end = end
+        self.completed = start
+        self.ahead = set()
+        self.lock = threading.Lock()
+        self.last_save = time.monotonic()
+
+    @classmethod
+    def from_args(cls, args, wordlist_paths, start, end):
+        """Build the checkpoint for indices [start, end); raises ValueError if --resume does not match it"""
+        if not args.checkpoint:
+            return cls(start=start, end=end)
+        checkpoint = cls(args.checkpoint, scan_fingerprint(args, wordlist_paths), start, end)
+        if args.resume and os.path.exists(args.checkpoint):
+            checkpoint.load()
+        return checkpoint
+
+    def load(self):
+        with open(self.path, encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("fingerprint") != self.fingerprint:
+            raise ValueError(f"checkpoint '{self.path}' was written for a different target, wordlist or options")
+        self.completed = state["completed"]
+        bitmap = int.from_bytes(base64.b64decode(state.get("done", "")), "little")
+        self.ahead = {self.completed + 1 + bit for bit in range(bitmap.bit_length()) if bitmap >> bit & 1}
+
+    @property
+    def finished(self):
+        return self.completed - self.start + len(self.ahead)
+
+    @property
+    def remaining(self):
+        return None if self.end is None else self.end - self.completed - len(self.ahead)
+
+    def pending(self, payloads):
+        """Pair payloads (already started at `completed`) with their index up to `end`, skipping ones finished out of order"""
+        ahead = frozenset(self.ahead)
+        stop = None if self.end is None else max(0, self.end - self.completed)
+        for index, item in enumerate(itertools.islice(payloads, stop), self.completed):
+            if index not in ahead:
+                yield index, item
+
+    def done(self, index):
+        if index is None:
+            # Payloads queued by --recursion-depth sit outside the wordlist's index space
+            return
+        with self.lock:
+            if not self.path:
+                self.completed += 1
+                return
+            if index == self.completed:
+                self.completed += 1
+                while self.completed in self.ahead:
+                    self.ahead.discard(self.completed)
+                    self.completed += 1
+            else:
+                self.ahead.add(index)
+            if self.path and time.monotonic() - self.last_save >= CHECKPOINT_INTERVAL:
+                self._save()
+
+    def save(self):
+        with self.lock:
+            if self.path:
+                self._save()
+
+    def _save(self):
+        bitmap = 0
+        for index in self.ahead:
+            bitmap |= 1 << (index - self.completed - 1)
+        state = {
+            "fingerprint": self.fingerprint,
+            "start": self.start,
+            "end": self.end,
+            "completed": self.completed,
+            "done": base64.b64encode(bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")).decode(),
+            "saved_at": datetime.now(timezone.utc).isoformat(),
+        }
+        # Write then rename, so an interrupted save never leaves a truncated checkpoint
+        temp = self.path + ".tmp"
+        with open(temp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(temp, self.path)
+        self.last_save = time.monotonic()
+
+
+# Upper bounds in seconds of the latency histogram buckets; one more slot counts everything slower
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Request phases in the order they happen; "total" is a whole probe including redirects
+PHASES = ("dns", "connect", "tls", "ttfb", "body", "total")
+
+# Seconds between progress redraws, --stats-file writes, and the window behind the current req/s
+PROGRESS_INTERVAL = 0.5
+STATS_INTERVAL = 5.0
+RATE_WINDOW = 5.0
+
+def histogram_quantile(counts, q):
+    """Estimate a quantile from bucket counts, interpolating linearly inside the bucket"""
+    total = sum(counts)
+    if not total:
+        return None
+    rank = q * total
+    seen = 0
+    for i, count in enumerate(counts):
+        if count and seen + count >= rank:
+            if i == len(LATENCY_BUCKETS):
+                return LATENCY_BUCKETS[-1]
+            lower = LATENCY_BUCKETS[i - 1] if i else 0.0
+            return lower + (LATENCY_BUCKETS[i] - lower) * (rank - seen) / count
+        seen += count
+    return LATENCY_BUCKETS[-1]
+
+def format_duration(seconds):
+    """Milliseconds below one second, seconds above"""
+    return f"{seconds * 1000:.1f}ms" if seconds < 1 else f"{seconds:.2f}s"
+
+class Telemetry:
+    """Per-phase latency histograms, response and error counters, progress and the --stats-file export
+
+    Workers record into it from any thread. A reporter thread redraws the progress line through
+    the result writer and rewrites the stats file; --processes children send snapshots instead.
+    """
+
+    def __init__(self, progress=False, stats_file=None, stats_format="json"):
+        self.progress = progress
+        self.stats_file = stats_file
+        self.stats_format = stats_format
+        self.lock = threading.Lock()
+        self.phases = {phase: [0] * (len(LATENCY_BUCKETS) + 1) for phase in PHASES}
+        self.sums = dict.fromkeys(PHASES, 0.0)
+        self.responses = {}
+        self.errors = {}
+        self.children = {}
+        self.checkpoint = None
+        self.resumed = 0
+        self.started = time.monotonic()
+        self.samples = deque()
+        self.stopping = threading.Event()
+        self.thread = None
+
+    @classmethod
+    def from_args(cls, args):
+        stats_format = args.stats_format or ("prometheus" if (args.stats_file or "").endswith(".prom") else "json")
+        progress = not args.no_progress and sys.stdout.isatty()
+        return cls(progress, args.stats_file, stats_format)
+
+    def __reduce__(self):
+        # Locks and threads don't cross process boundaries; a child starts with empty counters
+        return (Telemetry, ())
+
+    def observe(self, phase, seconds):
+        with self.lock:
+            self.phases[phase][bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            self.sums[phase] += seconds
+
+    def record(self, seconds, status=None, error=None):
+        """Count one finished probe by status class or exception type"""
+        with self.lock:
+            self.phases["total"][bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            self.sums["total"] += seconds
+            if error is not None:
+                name = type(error).__name__
+                self.errors[name] = self.errors.get(name, 0) + 1
+            else:
+                label = f"{status // 100}xx"
+                self.responses[label] = self.responses.get(label, 0) + 1
+
+    def merge(self, key, snapshot):
+        """Keep the latest snapshot of a --processes child"""
+        with self.lock:
+            self.children[key] = snapshot
+
+    def snapshot(self):
+        """Plain-data totals including any children, safe to pickle or serialise"""
+        checkpoint = self.checkpoint
+        with self.lock:
+            state = {
+                "phases": {phase: list(counts) for phase, counts in self.phases.items()},
+                "sums": dict(self.sums),
+                "responses": dict(self.responses),
+                "errors": dict(self.errors),
+                "done": checkpoint.finished if checkpoint else 0,
+                "resumed": self.resumed,
+                "total": checkpoint.end - checkpoint.start if checkpoint and checkpoint.end is not None else None,
+            }
+            children = list(self.children.values())
+        for child in children:
+            for phase, counts in child["phases"].items():
+                state["phases"][phase] = [a + b for a, b in zip(state["phases"][phase], counts)]
+                state["sums"][phase] += child["sums"][phase]
+            for field in ("responses", "errors"):
+                for key, count in child[field].items():
+                    state[field][key] = state[field].get(key, 0) + count
+            state["done"] += child["done"]
+            state["resumed"] += child["resumed"]
+        return state
+
+    @staticmethod
+    def requests(state):
+        return sum(state["responses"].values()) + sum(state["errors"].values())
+
+    def _rate(self, state, now):
+        """Requests per second over the last RATE_WINDOW seconds"""
+        count = self.requests(state)
+        self.samples.append((now, count))
+        while len(self.samples) > 2 and now - self.samples[1][0] >= RATE_WINDOW:
+            self.samples.popleft()
+        then, before = self.samples[0]
+        return (count - before) / (now - then) if now > then else 0.0
+
+    def progress_line(self, state, rate):
+        done, total = state["done"], state["total"]
+        requests_sent = self.requests(state)
+        errors = sum(state["errors"].values())
+        parts = []
+        if total:
+            filled = int(30 * min(done, total) / total)
+            parts.append(f"[{'#' * filled}{'-' * (30 - filled)}] {done / total:6.1%} {done}/{total}")
+        else:
+            parts.append(f"{done} done")
+        parts.append(f"{rate:.0f} req/s")
+        parts.append(f"{errors / requests_sent if requests_sent else 0:.1%} errors")
+        elapsed = time.monotonic() - self.started
+        fresh = done - state["resumed"]
+        if total and fresh > 0 and elapsed > 0:
+            remaining = int((total - done) * elapsed / fresh)
+            parts.append(f"ETA {remaining // 3600}:{remaining // 60 % 60:02d}:{remaining % 60:02d}")
+        return " | ".join(parts)
+
+    def export(self, state, rate):
+        """The stats file body in the configured format"""
+        elapsed = time.monotonic() - self.started
+        if self.stats_format == "prometheus":
+            lines = [
+                "# HELP fuzzhound_phase_seconds Request phase latency.",
+                "# TYPE fuzzhound_phase_seconds histogram",
+            ]
+            for phase in PHASES:
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), state["phases"][phase]):
+                    cumulative += count
+                    lines.append(f'fuzzhound_phase_seconds_bucket{{phase="{phase}",le="{bound}"}} {cumulative}')
+                lines.append(f'fuzzhound_phase_seconds_sum{{phase="{phase}"}} {state["sums"][phase]:.6f}')
+                lines.append(f'fuzzhound_phase_seconds_count{{phase="{phase}"}} {cumulative}')
+            lines += ["# HELP fuzzhound_responses_total Responses by status class.", "# TYPE fuzzhound_responses_total counter"]
+            lines += [f'fuzzhound_responses_total{{class="{label}"}} {count}' for label, count in sorted(state["responses"].items())]
+            lines += ["# HELP fuzzhound_errors_total Failed probes by exception type.", "# TYPE fuzzhound_errors_total counter"]
+            lines += [f'fuzzhound_errors_total{{type="{name}"}} {count}' for name, count in sorted(state["errors"].items())]
+            lines += [
+                "# TYPE fuzzhound_payloads_done gauge", f"fuzzhound_payloads_done {state['done']}",
+                "# TYPE fuzzhound_requests_per_second gauge", f"fuzzhound_requests_per_second {rate:.2f}",
+                "# TYPE fuzzhound_elapsed_seconds gauge", f"fuzzhound_elapsed_seconds {elapsed:.2f}",
+            ]
+            if state["total"] is not None:
+                lines += ["# TYPE fuzzhound_payloads_total gauge", f"fuzzhound_payloads_total {state['total']}"]
+            return "\n".join(lines) + "\n"
+        return json.dumps(self.report(state, rate), indent=2) + "\n"
+
+    def report(self, state, rate):
+        """The JSON stats file contents as a dict; also what Scanner.stats() returns"""
+        requests_sent = self.requests(state)
+        report = {
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+            "elapsed": round(time.monotonic() - self.started, 2),
+            "payloads": {"done": state["done"], "total": state["total"]},
+            "requests": requests_sent,
+            "requests_per_second": round(rate, 2),
+            "error_rate": round(sum(state["errors"].values()) / requests_sent, 4) if requests_sent else 0.0,
+            "responses": state["responses"],
+            "errors": state["errors"],
+            "phases": {},
+        }
+        for phase in PHASES:
+            counts = state["phases"][phase]
+            if not sum(counts):
+                continue
+            report["phases"][phase] = {
+                "count": sum(counts),
+                "mean": round(state["sums"][phase] / sum(counts), 6),
+                **{name: round(histogram_quantile(counts, q), 6) for name, q in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))},
+                "buckets": dict(zip([str(bound) for bound in LATENCY_BUCKETS] + ["+Inf"], counts)),
+            }
+        return report
+
+    def summary(self):
+        """One line of p50/p95 per phase for the end-of-scan report, or None before any request"""
+        state = self.snapshot()
+        parts = []
+        for phase in PHASES:
+            counts = state["phases"][phase]
+            if sum(counts):
+                parts.append(f"{phase} {format_duration(histogram_quantile(counts, 0.5))}/{format_duration(histogram_quantile(counts, 0.95))}")
+        if not parts:
+            return None
+        outcomes = [f"{label} {count}" for label, count in sorted(state["responses"].items())]
+        outcomes += [f"{name} {count}" for name, count in sorted(state["errors"].items(), key=lambda item: -item[1])]
+        return "p50/p95 " + ", ".join(parts) + " | " + ", ".join(outcomes)
+
+    def start(self, results, checkpoint):
+        """Track progress against checkpoint and start redrawing/exporting if anything is enabled"""
+        self.checkpoint = checkpoint
+        self.resumed = checkpoint.finished
+        self.started = time.monotonic()
+        if self.progress or self.stats_file:
+            self.stopping.clear()
+            self.thread = threading.Thread(target=self._report, args=(results,), daemon=True)
+            self.thread.start()
+
+    def stop(self, results):
+        if self.thread is None:
+            return
+        self.stopping.set()
+        self.thread.join()
+        self.thread = None
+        state = self.snapshot()
+        self._write_stats(state, self._rate(state, time.monotonic()))
+        if self.progress:
+            results.progress(None)
+
+    def _report(self, results):
+        last_write = time.monotonic()
+        while not self.stopping.wait(PROGRESS_INTERVAL):
+            state = self.snapshot()
+            now = time.monotonic()
+            rate = self._rate(state, now)
+            if self.progress:
+                results.progress(self.progress_line(state, rate))
+            if now - last_write >= STATS_INTERVAL:
+                self._write_stats(state, rate)
+                last_write = now
+
+    def _write_stats(self, state, rate):
+        if not self.stats_file:
+            return
+        temp = self.stats_file + ".tmp"
+        with open(temp, "w", encoding="utf-8") as f:
+            f.write(self.export(state, rate))
+        os.replace(temp, self.stats_file)
+
+
+class ConnectionStats:
+    """Thread-safe counter of pooled connections reused vs. newly opened"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.opened = 0
+        self.reused = 0
+
+    def record(self, reused):
+        with self.lock:
+            if reused:
+                self.reused += 1
+            else:
+                self.opened += 1
+
+    def summary(self):
+        total = self.opened + self.reused
+        rate = (self.reused / total * 100) if total else 0.0
+        return f"{self.opened} opened, {self.reused} reused ({rate:.1f}% reuse)"
+
+
+# Connection setup phases measured on the current thread, picked up by send_timed()
+connection_timings = threading.local()
+
+class TimedConnectionMixin:
+    """Splits connect() into TCP (including the name lookup urllib3 does there) and TLS"""
+
+    def _new_conn(self):
+        started = time.monotonic()
+        try:
+            return super()._new_conn()
+        finally:
+            self.tcp_seconds = time.monotonic() - started
+
+    def connect(self):
+        started = time.monotonic()
+        super().connect()
+        phases = getattr(connection_timings, "phases", None)
+        if phases is not None:
+            phases.append(("connect", self.tcp_seconds))
+            if isinstance(self, HTTPSConnection):
+                phases.append(("tls", time.monotonic() - started - self.tcp_seconds))
+
+
+class TimedHTTPConnection(TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class CountingHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+    stats = None
+
+    def _get_conn(self, timeout=None):
+        conn = super()._get_conn(timeout)
+        # A checked-out connection without a socket (fresh or dropped) will reconnect
+        if self.stats is not None:
+            self.stats.record(reused=conn.sock is not None)
+        return conn
+
+
+class CountingHTTPSConnectionPool(HTTPSConnectionPool, CountingHTTPConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class CountingPoolManager(PoolManager):
+    def __init__(self, *args, stats=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = stats
+        self.pool_classes_by_scheme = {
+            "http": CountingHTTPConnectionPool,
+            "https": CountingHTTPSConnectionPool,
+        }
+
+    def _new_pool(self, scheme, host, port, request_context=None):
+        pool = super()._new_pool(scheme, host, port, request_context)
+        pool.stats = self.stats
+        return pool
+
+
+class PooledAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools report reuse statistics"""
+
+    def __init__(self, stats, **kwargs):
+        self.stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+        self.poolmanager = CountingPoolManager(
+            num_pools=connections, maxsize=maxsize, block=block, stats=self.stats, **pool_kwargs
+        )
+
+
+class ConnectionPool:
+    """Keep-alive sessions, one per worker thread, sharing a single pooled adapter"""
+
+    def __init__(self, args):
+        self.stats = ConnectionStats()
+        pool_size = args.pool_size or args.threads
+        block = False
+        if args.max_host_connections:
+            pool_size = args.max_host_connections
+            block = True
+        # Failed connects are retried for any method; nothing is resent once a request may have reached the server
+        retries = Retry(total=args.retries, read=0, backoff_factor=0.1, allowed_methods=None, raise_on_status=False)
+        # urllib3 keeps one pool per host in an LRU of this size; --targets-file visits every host in
+        # turn, so it must hold all of them (twice over, for http -> https redirects) or each turn starts cold
+        hosts = {urlsplit(target).netloc.lower() for target, _ in args.targets if "://" in target}
+        self.adapter = PooledAdapter(
+            self.stats,
+            pool_connections=max(args.threads, 10, 2 * len(hosts)),
+            pool_maxsize=pool_size,
+            pool_block=block,
+            max_retries=retries,
+        )
+        self.local = threading.local()
+        self.sessions = []
+        self.lock = threading.Lock()
+
+    def session(self):
+        """Return the calling thread's session, creating it on first use"""
+        session = getattr(self.local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.mount("http://", self.adapter)
+            session.mount("https://", self.adapter)
+            self.local.session = session
+            with self.lock:
+                self.sessions.append(session)
+        return session
+
+    def close(self):
+        with self.lock:
+            for session in self.sessions:
+                session.close()
+            self.sessions = []
+        self.adapter.close()
+
+
+def parse_rate(value):
+    """argparse type for request rates such as 50, 50/s or 600/m"""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*(?:/\s*([sm]))?\s*", value)
+    if not match or float(match.group(1)) <= 0:
+        raise argparse.ArgumentTypeError(f"invalid rate '{value}' (examples: 50, 50/s, 600/m)")
+    return float(match.group(1)) / (60 if match.group(2) == "m" else 1)
+
+# Longest Retry-After we honour, in seconds
+MAX_RETRY_AFTER = 120
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date), or None"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        seconds = int(value)
+    else:
+        try:
+            seconds = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0), MAX_RETRY_AFTER)
+
+
+class RateLimiter:
+    """Token bucket shared by every worker; also holds global pauses requested via Retry-After"""
+
+    def __init__(self, rate=None, burst=None):
+        self.rate = rate
+        self.capacity = burst or (max(1.0, rate) if rate else 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def _reserve(self):
+        """Take a token and return how long the caller must wait before using it"""
+        with self.lock:
+            now = time.monotonic()
+            wait_for = max(0.0, self.paused_until - now)
+            if self.rate:
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                self.tokens -= 1
+                if self.tokens < 0:
+                    wait_for = max(wait_for, -self.tokens / self.rate)
+            return wait_for
+
+    def try_acquire(self):
+        """Take a token if one is ready and return 0; otherwise take nothing and return the seconds until one is"""
+        with self.lock:
+            now = time.monotonic()
+            if self.paused_until > now:
+                return self.paused_until - now
+            if not self.rate:
+                return 0.0
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens < 1:
+                return (1 - self.tokens) / self.rate
+            self.tokens -= 1
+            return 0.0
+
+    def acquire(self):
+        wait_for = self._reserve()
+        if wait_for:
+            time.sleep(wait_for)
+
+    async def acquire_async(self):
+        wait_for = self._reserve()
+        if wait_for:
+            await asyncio.sleep(wait_for)
+
+    def pause(self, seconds):
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+class AdaptiveController:
+    """AIMD concurrency limit: grows while latency and errors stay flat, halves when the target pushes back"""
+
+    def __init__(self, ceiling, floor=1, window=50):
+        self.ceiling = ceiling
+        self.floor = floor
+        self.limit = max(floor, min(ceiling, 10))
+        self.window = window
+        self.latencies = []
+        self.errors = 0
+        self.baseline = None
+        self.last_decrease = 0.0
+        self.lowest = self.highest = self.limit
+        self.lock = threading.Lock()
+
+    def record(self, latency, status=None, error=None):
+        """Feed one finished request; returns a human readable reason when the limit changed"""
+        throttled = status in (429, 503)
+        timed_out = isinstance(error, (requests.exceptions.Timeout, asyncio.TimeoutError))
+        with self.lock:
+            if throttled or timed_out:
+                # Back off at most once per cooldown so one burst of 429s does not collapse to the floor
+                now = time.monotonic()
+                cooldown = max(1.0, 2 * (self.baseline or 0.5))
+                if now - self.last_decrease >= cooldown:
+                    self.last_decrease = now
+                    return self._set(self.limit // 2, f"HTTP {status}" if throttled else "timeouts")
+                return None
+
+            self.latencies.append(latency)
+            self.errors += error is not None
+            if len(self.latencies) < self.window:
+                return None
+
+            p95 = sorted(self.latencies)[int(len(self.latencies) * 0.95) - 1]
+            error_rate = self.errors / len(self.latencies)
+            self.latencies = []
+            self.errors = 0
+            if self.baseline is None:
+                self.baseline = p95
+                return None
+            if p95 > self.baseline * 2:
+                return self._set(int(self.limit * 0.7), f"p95 latency {p95 * 1000:.0f}ms")
+            # Follow improvements immediately, drift slowly towards slower baselines
+            self.baseline = p95 if p95 < self.baseline else 0.9 * self.baseline + 0.1 * p95
+            if error_rate <= 0.01 and p95 <= self.baseline * 1.5:
+                return self._set(self.limit + max(1, self.limit // 10), "stable")
+            return None
+
+    def _set(self, limit, reason):
+        old = self.limit
+        self.limit = max(self.floor, min(self.ceiling, limit))
+        self.lowest = min(self.lowest, self.limit)
+        self.highest = max(self.highest, self.limit)
+        return f"concurrency {old} -> {self.limit} ({reason})" if self.limit != old else None
+
+
+class Throttle:
+    """Global pacing for every probe: the --rate token bucket plus the optional --adaptive controller"""
+
+    def __init__(self, args, ceiling, results):
+        self.limiter = RateLimiter(args.rate) if args.rate or args.adaptive else None
+        self.controller = AdaptiveController(ceiling) if args.adaptive else None
+        self.in_flight = 0
+        self.slot_freed = threading.Condition()
+        self.async_slot_freed = None
+        self.verbose = args.verbose
+        self.telemetry = args.telemetry
+        self.results = results
+
+    def call(self, fn, *args, **kwargs):
+        """Run one request under the global rate and concurrency limits"""
+        if self.controller:
+            with self.slot_freed:
+                while self.in_flight >= self.controller.limit:
+                    self.slot_freed.wait()
+                self.in_flight += 1
+        try:
+            if self.limiter:
+                self.limiter.acquire()
+            started = time.monotonic()
+            try:
+                res = fn(*args, **kwargs)
+            except Exception as e:
+                self._observe(started, None, e)
+                raise
+            self._observe(started, res, None)
+            return res
+        finally:
+            if self.controller:
+                with self.slot_freed:
+                    self.in_flight -= 1
+                    self.slot_freed.notify_all()
+
+    async def call_async(self, fn, *args, **kwargs):
+        """Asyncio twin of call(); fn is a coroutine function"""
+        if self.controller:
+            if self.async_slot_freed is None:
+                self.async_slot_freed = asyncio.Condition()
+            async with self.async_slot_freed:
+                await self.async_slot_freed.wait_for(lambda: self.in_flight < self.controller.limit)
+                self.in_flight += 1
+        try:
+            if self.limiter:
+                await self.limiter.acquire_async()
+            started = time.monotonic()
+            try:
+                res = await fn(*args, **kwargs)
+            except Exception as e:
+                self._observe(started, None, e)
+                raise
+            self._observe(started, res, None)
+            return res
+        finally:
+            if self.controller:
+                async with self.async_slot_freed:
+                    self.in_flight -= 1
+                    self.async_slot_freed.notify_all()
+
+    def _observe(self, started, res, error):
+        latency = time.monotonic() - started
+        self.telemetry.record(latency, res.status_code if res is not None else None, error)
+        if res is not None and self.limiter:
+            retry_after = parse_retry_after(res.headers.get("retry-after")) if res.status_code in (429, 503) else None
+            if retry_after:
+                self.limiter.pause(retry_after)
+        if not self.controller:
+            return
+        change = self.controller.record(latency, res.status_code if res is not None else None, error)
+        if change and self.verbose:
+            self.results.note(Fore.MAGENTA + f"[~] Adaptive: {change}")
+
+    def summary(self):
+        controller = self.controller
+        return f"final concurrency {controller.limit} (range {controller.lowest}-{controller.highest})"
+
+
+# Class escapes whose meaning differs between text and bytes patterns
+UNICODE_CLASS_ESCAPE = re.compile(r"\\[wWbBsSdD]")
+
+def is_ascii_compatible(charset):
+    """True if ASCII text is stored as the same bytes in this charset and those bytes mean nothing else"""
+    return charset in ("utf-8", "ascii", "latin-1") or charset.startswith(("iso8859-", "cp125"))
+
+class ResponseFilter:
+    """Status, size and content filters compiled once from the command line"""
+
+    def __init__(self, statuses=None, sizes=None, size_ranges=(), include=None, exclude=None):
+        self.statuses = statuses
+        self.sizes = sizes
+        self.size_ranges = tuple(size_ranges)
+        self.include = include
+        self.exclude = exclude
+        self.has_size_filter = sizes is not None or bool(self.size_ranges)
+
+    @classmethod
+    def from_args(cls, args):
+        """Compile the --filter-*/--exclude-content arguments; raises ValueError on bad input"""
+        statuses = None
+        if args.filter_status:
+            statuses = set()
+            for token in cls._tokens(args.filter_status, "status"):
+                if '-' in token:
+                    start, end = cls._ints(token.split('-', 1), "status range", token)
+                    statuses.update(range(start, end + 1))
+                else:
+                    statuses.add(cls._ints([token], "status code", token)[0])
+            statuses = frozenset(statuses)
+
+        sizes = None
+        size_ranges = []
+        if args.filter_size:
+            exact = set()
+            for token in cls._tokens(args.filter_size, "size"):
+                if token.startswith('>'):
+                    size_ranges.append((cls._ints([token[1:]], "size", token)[0] + 1, math.inf))
+                elif token.startswith('<'):
+                    size_ranges.append((-math.inf, cls._ints([token[1:]], "size", token)[0] - 1))
+                elif '-' in token:
+                    size_ranges.append(tuple(cls._ints(token.split('-', 1), "size range", token)))
+                else:
+                    exact.add(cls._ints([token], "size", token)[0])
+            sizes = frozenset(exact) if exact else None
+
+        return cls(
+            statuses=statuses,
+            sizes=sizes,
+            size_ranges=size_ranges,
+            include=cls._compile(args.filter_content, "--filter-content"),
+            exclude=cls._compile(args.exclude_content, "--exclude-content"),
+        )
+
+    @staticmethod
+    def _tokens(spec, name):
+        tokens = [token.strip() for token in spec.split(',') if token.strip()]
+        if not tokens:
+            raise ValueError(f"Empty {name} filter")
+        return tokens
+
+    @staticmethod
+    def _ints(values, name, token):
+        try:
+            return [int(value.strip()) for value in values]
+        except ValueError:
+            raise ValueError(f"Invalid {name} '{token}'") from None
+
+    @staticmethod
+    def _compile(spec, option):
+        """Merge comma-separated patterns into one alternation, plus a bytes twin for ASCII patterns"""
+        if not spec:
+            return None
+        pattern = "|".join(f"(?:{p})" for p in spec.split(','))
+        try:
+            text_regex = re.compile(pattern, re.IGNORECASE)
+        except re.error as e:
+            raise ValueError(f"Invalid {option} pattern '{spec}': {e}") from None
+        # ASCII-only patterns can run on ASCII bodies without decoding them, unless they use classes
+        # (\w, \b, \s, \d) that differ on text and bytes even for ASCII input (\s matches \x1c on text)
+        bytes_regex = None
+        if pattern.isascii() and not UNICODE_CLASS_ESCAPE.search(pattern):
+            try:
+                bytes_regex = re.compile(pattern.encode(), re.IGNORECASE)
+            except re.error:
+                pass  # Escapes such as \u00e9 or \N{...} only exist for text patterns
+        return text_regex, bytes_regex
+
+    @property
+    def needs_body(self):
+        return self.include is not None or self.exclude is not None
+
+    def matches(self, status, content_length, response=None):
+        """Check if a response passes every active filter"""
+        if self.statuses is not None and status not in self.statuses:
+            return False
+
+        # A truncated body of unknown size can't be judged by size, so those filters let it through
+        if self.has_size_filter and content_length is not None:
+            if not ((self.sizes is not None and content_length in self.sizes) or
+                    any(low <= content_length <= high for low, high in self.size_ranges)):
+                return False
+
+        if self.include is not None and not self._search(self.include, response):
+            return False
+
+        if self.exclude is not None and self._search(self.exclude, response):
+            return False
+
+        return True
+
+    @staticmethod
+    def _search(regexes, response):
+        text_regex, bytes_regex = regexes
+        # Only an ASCII body reads the same as bytes and as text: past ASCII, '.', [^x] and {n} would
+        # count bytes instead of characters, and case folding (k and KELVIN SIGN, \xe9 and É) would differ
+        if bytes_regex is not None and response.content.isascii() and is_ascii_compatible(response.charset):
+            return bytes_regex.search(response.content) is not None
+        return text_regex.search(response.text) is not None
+
+# Only this much of each body is tokenised for its fingerprint
+FINGERPRINT_BYTES = 64 * 1024
+
+# Near-duplicates: simhashes at most this many bits apart; with 4 bands of 16 bits any such pair
+# shares at least one band exactly, so candidates come from a dict lookup instead of a scan
+SIMHASH_DISTANCE = 3
+SIMHASH_BANDS = 4
+# Bodies with fewer distinct tokens than this only group on an exact fingerprint
+SIMHASH_MIN_TOKENS = 8
+
+# Random payload shapes sent by --auto-calibrate; each {} is a fresh random string
+CALIBRATION_SHAPES = ("{}", "{}{}{}", ".{}", "{}/")
+
+# Tokens are runs of letters, lower-cased: digits split them, so counters, timestamps and request IDs
+# drop out of the simhash. A translate table does the folding and splitting in one C pass.
+TOKEN_TABLE = bytes(c + 32 if 65 <= c <= 90 else c if 97 <= c <= 122 else 32 for c in range(256))
+
+# Per-bit vote counters packed into one integer: digest byte k, value v adds 1 to lanes 8k..8k+7
+SIMHASH_LANE_BITS = 20
+SIMHASH_LANES = [
+    [sum(1 << ((k * 8 + j) * SIMHASH_LANE_BITS) for j in range(8) if value >> j & 1) for value in range(256)]
+    for k in range(8)
+]
+
+# Pages of one site share most of their vocabulary, so each token's packed votes are computed once
+SIMHASH_CACHE = {}
+SIMHASH_CACHE_LIMIT = 1 << 16
+
+def token_votes(token):
+    votes = SIMHASH_CACHE.get(token)
+    if votes is None:
+        digest = hashlib.blake2b(token, digest_size=8).digest()
+        votes = sum(SIMHASH_LANES[k][byte] for k, byte in enumerate(digest))
+        if len(SIMHASH_CACHE) >= SIMHASH_CACHE_LIMIT:
+            SIMHASH_CACHE.clear()
+        SIMHASH_CACHE[token] = votes
+    return votes
+
+def simhash(tokens):
+    """64-bit simhash of a set of byte tokens"""
+    votes = sum(map(token_votes, tokens))
+    half = len(tokens) / 2
+    mask = (1 << SIMHASH_LANE_BITS) - 1
+    value = 0
+    for bit in range(64):
+        if (votes >> (bit * SIMHASH_LANE_BITS)) & mask > half:
+            value |= 1 << bit
+    return value
+
+class ResponseGroup:
+    """Responses sharing one fingerprint: a calibration baseline or a collapsed group of hits"""
+
+    __slots__ = ("id", "status", "size", "words", "lines", "simhash", "baseline", "count", "record")
+
+    def __init__(self, status, size, words, lines, simhash, baseline):
+        self.id = hashlib.blake2b(f"{status} {size} {words} {lines} {simhash}".encode(), digest_size=6).hexdigest()
+        self.status = status
+        self.size = size
+        self.words = words
+        self.lines = lines
+        self.simhash = simhash
+        self.baseline = baseline
+        self.count = 0
+        self.record = None
+
+    def describe(self, size=None):
+        """Terminal summary; `size` overrides the fingerprint's size, which excludes reflected payloads"""
+        size = self.size if size is None else size
+        return f"[{self.status}] [Size: {format_size(size)}] [Words: {self.words}] [Lines: {self.lines}] [Fingerprint: {self.id}]"
+
+class ResponseIndex:
+    """Streaming response fingerprints for --auto-calibrate baselines and --collapse groups
+
+    A fingerprint is the status, the size, word and line counts of the body with the payload
+    removed, and a simhash of its tokens. Each response costs one exact-key lookup and, failing
+    that, one lookup per simhash band.
+    """
+
+    def __init__(self, collapse=False):
+        self.collapse = collapse
+        self.lock = threading.Lock()
+        self.exact = {}
+        self.bands = {}
+        self.groups = []
+        self.calibrated = False
+        self.filtered = 0
+        self.collapsed = 0
+
+    @classmethod
+    def from_args(cls, args):
+        if not (args.auto_calibrate or args.collapse):
+            return None
+        return cls(args.collapse)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint(res, reflections):
+        """(status, size, words, lines, simhash or None) of a response with reflected payloads removed"""
+        body = res.content[:FINGERPRINT_BYTES]
+        size = len(res.content) if res.size is None else res.size
+        for word in reflections:
+            needle = word.encode(errors="ignore")
+            if needle and needle in body:
+                size -= body.count(needle) * len(needle)
+                body = body.replace(needle, b"")
+        words = len(body.split())
+        lines = body.count(b"\n") + 1 if body else 0
+        tokens = set(body.translate(TOKEN_TABLE).split())
+        return res.status_code, size, words, lines, simhash(tokens) if len(tokens) >= SIMHASH_MIN_TOKENS else None
+
+    @staticmethod
+    def _bands(status, value):
+        width = 64 // SIMHASH_BANDS
+        return [(status, band, value >> (band * width) & ((1 << width) - 1)) for band in range(SIMHASH_BANDS)]
+
+    def _find(self, fingerprint):
+        group = self.exact.get(fingerprint)
+        if group is not None or fingerprint[4] is None:
+            return group
+        status, value = fingerprint[0], fingerprint[4]
+        for band in self._bands(status, value):
+            for candidate in self.bands.get(band, ()):
+                if bin(candidate.simhash ^ value).count("1") <= SIMHASH_DISTANCE:
+                    # Remember the exact variant so its next occurrence is a single lookup
+                    self.exact[fingerprint] = candidate
+                    return candidate
+        return None
+
+    def _add(self, fingerprint, baseline):
+        group = ResponseGroup(*fingerprint, baseline)
+        self.exact[fingerprint] = group
+        if group.simhash is not None:
+            for band in self._bands(group.status, group.simhash):
+                self.bands.setdefault(band, []).append(group)
+        self.groups.append(group)
+        return group
+
+    def add_baseline(self, res, reflections):
+        """Learn a calibration response; returns its group and whether it was new"""
+        fingerprint = self.fingerprint(res, reflections)
+        with self.lock:
+            group = self._find(fingerprint)
+            if group is not None:
+                return group, False
+            return self._add(fingerprint, True), True
+
+    def admit(self, res, reflections):
+        """Classify a response: returns (report it?, its group or None)"""
+        fingerprint = self.fingerprint(res, reflections)
+        with self.lock:
+            group = self._find(fingerprint)
+            if group is not None and group.baseline:
+                self.filtered += 1
+                return False, group
+            if not self.collapse:
+                return True, None
+            if group is None:
+                group = self._add(fingerprint, False)
+            group.count += 1
+            if group.count > 1:
+                self.collapsed += 1
+                return False, group
+            return True, group
+
+    def report(self, results):
+        """Add a duplicates count for each group that absorbed near-duplicates; the first hit is already recorded"""
+        with self.lock:
+            groups = [group for group in self.groups if group.count > 1 and group.record is not None]
+        for group in groups:
+            results.echo(Fore.BLUE + f"[~] {group.count - 1} more like {group.record['url']} {group.describe(format_size(group.record['size']))}")
+            results.append_summary({"fingerprint": group.id, "duplicates": group.count - 1})
+
+    def summary(self):
+        parts = []
+        if self.calibrated:
+            baselines = sum(1 for group in self.groups if group.baseline)
+            parts.append(f"{self.filtered} responses matched {baselines} calibration baseline(s)")
+        if self.collapse:
+            groups = sum(1 for group in self.groups if group.count > 1)
+            parts.append(f"{self.collapsed} near-duplicates collapsed into {groups} group(s)")
+        return ", ".join(parts)
+
+# Bodies up to this size are read even when unneeded so the keep-alive connection stays reusable
+DRAIN_LIMIT = 64 * 1024
+
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+MAX_REDIRECTS = 10
+
+def parse_size(value):
+    """argparse type for byte sizes such as 65536, 64k or 2m"""
+    match = re.fullmatch(r"\s*(\d+)\s*([kKmMgG]?)[bB]?\s*", value)
+    if not match:
+        raise argparse.ArgumentTypeError(f"invalid size '{value}' (examples: 65536, 64k, 2m)")
+    return int(match.group(1)) * {"": 1, "k": 1 << 10, "m": 1 << 20, "g": 1 << 30}[match.group(2).lower()]
+
+class ScanResponse:
+    """Status, headers and (possibly truncated) body of a probed URL, shared by both engines"""
+
+    def __init__(self, url, status_code, headers, content, size, history=None):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.size = size
+        self.history = history or []
+
+    @property
+    def charset(self):
+        """Body charset from Content-Type; unknown or missing charsets are read as UTF-8"""
+        match = re.search(r"charset=([\w-]+)", self.headers.get("content-type", ""), re.IGNORECASE)
+        if match:
+            try:
+                return codecs.lookup(match.group(1)).name
+            except LookupError:
+                pass
+        return "utf-8"
+
+    @property
+    def text(self):
+        return self.content.decode(self.charset, errors="replace")
+
+def apply_status_probe(args, method, headers):
+    """Swap a GET for a HEAD or a one-byte Range request when --status-probe is set"""
+    if method != "GET" or not args.status_probe:
+        return method, headers
+    if args.status_probe == "head":
+        return "HEAD", headers
+    return method, dict(headers, Range="bytes=0-0")
+
+def body_read_limit(args, headers, method, hop=False):
+    """Decide how much body to read: returns (declared length or None, byte limit or None); a limit of 0 skips it"""
+    known_length = None
+    encoding = headers.get("content-encoding", "").lower()
+    length = (headers.get("content-length") or "").strip()
+    # Content-Length counts encoded bytes; only trust it when the body is not compressed
+    if encoding in ("", "identity") and length.isdigit():
+        known_length = int(length)
+
+    if method == "HEAD":
+        return known_length, 0
+    if hop:
+        # Redirect hop: never needed, only drained when small enough to keep the connection
+        return known_length, 0 if known_length is not None and known_length > DRAIN_LIMIT else DRAIN_LIMIT
+    needs_body = args.response_filter.needs_body or args.response_index is not None
+    if not needs_body and known_length is not None and known_length > DRAIN_LIMIT:
+        return known_length, 0
+    return known_length, args.max_body or None
+
+def make_response(args, url, status, headers, content, complete, known_length):
+    """Build a ScanResponse, sizing it from Content-Length when the body was not read in full
+
+    A body cut short without a Content-Length has no known size: `size` is None rather than the
+    length of the part that was read.
+    """
+    size = len(content) if complete else known_length
+
+    content_range = headers.get("content-range", "")
+    if args.status_probe == "range" and status in (206, 416) and "/" in content_range:
+        # Report the status and size of the whole resource, not of our one-byte slice
+        total = content_range.rsplit("/", 1)[1].strip()
+        status = 200
+        size = int(total) if total.isdigit() else size
+    return ScanResponse(url, status, headers, content, size)
+
+def format_size(size):
+    """A response size for the terminal; None (cut at --max-body, no Content-Length) shows as unknown"""
+    return "unknown" if size is None else size
+
+def read_response(args, res, hop=False):
+    """Read a streamed requests response within the --max-body budget"""
+    started = time.monotonic()
+    known_length, limit = body_read_limit(args, res.headers, res.request.method, hop)
+
+    chunks = []
+    total = 0
+    complete = limit != 0 or known_length == 0
+    # HEAD, 204 and 304 responses never carry a body, so their connection is always reusable
+    unread = not complete and res.request.method != "HEAD" and res.status_code not in (204, 304)
+    if limit != 0:
+        for chunk in res.iter_content(chunk_size=16 * 1024):
+            chunks.append(chunk)
+            total += len(chunk)
+            if limit is not None and total > limit:
+                complete = False
+                unread = True
+                break
+    if unread:
+        # Dropping the connection is cheaper than draining a body nobody needs
+        res.close()
+    else:
+        res.raw.release_conn()
+
+    content = b"".join(chunks)
+    if limit:
+        content = content[:limit]
+    args.telemetry.observe("body", time.monotonic() - started)
+    return make_response(args, res.url, res.status_code, res.headers, content, complete, known_length)
+
+def next_hop(method, data, url, status, location):
+    """Method, body and URL of the request that follows a redirect"""
+    if status == 303 or (status in (301, 302) and method == "POST"):
+        method, data = "GET", None
+    return method, data, urljoin(url, location)
+
+# Credentials a redirect must not carry to another scheme, host or port; requests' own rule decides when
+CREDENTIAL_HEADERS = frozenset(("authorization", "cookie", "proxy-authorization"))
+REDIRECT_POLICY = requests.sessions.SessionRedirectMixin()
+
+def hop_headers(headers, url, next_url):
+    """Headers for the next redirect hop: -H credentials are dropped when it leaves the origin, as requests does"""
+    if not headers or not REDIRECT_POLICY.should_strip_auth(url, next_url):
+        return headers
+    return {name: value for name, value in headers.items() if name.lower() not in CREDENTIAL_HEADERS}
+
+def send_timed(args, session, method, url, **kwargs):
+    """session.request() that records connection setup and time to first byte"""
+    setup = connection_timings.phases = []
+    started = time.monotonic()
+    try:
+        res = session.request(method, url, **kwargs)
+    finally:
+        connection_timings.phases = None
+    for phase, seconds in setup:
+        args.telemetry.observe(phase, seconds)
+    args.telemetry.observe("ttfb", time.monotonic() - started - sum(seconds for _, seconds in setup))
+    return res
+
+def fetch(args, session, method, url, headers=None, data=None, allow_redirects=True, **kwargs):
+    """Send one probe on a pooled session, following redirects without downloading hop bodies"""
+    history = []
+    for _ in range(MAX_REDIRECTS + 1):
+        res = send_timed(args, session, method, url, headers=headers, data=data, stream=True, allow_redirects=False,
+                         timeout=(args.connect_timeout, args.read_timeout), **kwargs)
+        location = res.headers.get("location")
+        if not allow_redirects or res.status_code not in REDIRECT_STATUSES or not location:
+            response = read_response(args, res)
+            response.history = history
+            return response
+        history.append({"status": res.status_code, "url": url})
+        read_response(args, res, hop=True)
+        method, data, next_url = next_hop(method, data, url, res.status_code, location)
+        headers, url = hop_headers(headers, url, next_url), next_url
+    raise requests.exceptions.TooManyRedirects(f"Exceeded {MAX_REDIRECTS} redirects", response=res)
+
+def parse_headers(header_string):
+    """Parse the -H string into a headers dict"""
+    headers = {}
+    if header_string:
+        for h in header_string.split(","):
+            if ":" in h:
+                k, v = h.split(":", 1)
+                headers[k.strip()] = v.strip()
+    return headers
+
+# FUZZ is wordlist 1, FUZ2Z wordlist 2 and so on; the body also accepts the older wordlist_N form.
+# Numbers start at 1, so FUZ0Z or wordlist_0 stay literal text rather than naming a wordlist.
+SLOT_PATTERN = re.compile(r"FUZZ|FUZ([1-9]\d*)Z")
+BODY_SLOT_PATTERN = re.compile(r"FUZZ|FUZ([1-9]\d*)Z|wordlist_([1-9]\d*)")
+
+# Characters left alone in path and query slots: RFC 3986 unreserved, '%' so pre-encoded payloads pass
+# through, and the path delimiters a directory wordlist relies on ('&', '=', '+' and '#' stay encoded in queries)
+PATH_SAFE = "/%:@!$&'()*+,;=?~"
+QUERY_SAFE = "/%:@!$'()*,;?~"
+
+def encode_path(word):
+    return quote(word, safe=PATH_SAFE)
+
+def encode_query(word):
+    return quote(word, safe=QUERY_SAFE)
+
+def encode_form(word):
+    return quote_plus(word, safe="%")
+
+def encode_json(word):
+    return json.dumps(word)[1:-1]
+
+def encode_header(word):
+    return word.replace("\r", "").replace("\n", "")
+
+class Segments:
+    """A string compiled into literal pieces and payload slots, rendered with one join"""
+
+    __slots__ = ("pieces", "slots")
+
+    def __init__(self, text, pattern=SLOT_PATTERN, encoder=None):
+        self.pieces = []
+        self.slots = []  # (position in pieces, wordlist index, encoder or None)
+        last = 0
+        for match in pattern.finditer(text):
+            self.pieces.append(text[last:match.start()])
+            number = next((int(group) for group in match.groups() if group), 1)
+            self.slots.append((len(self.pieces), number - 1, encoder(match.start()) if encoder else None))
+            self.pieces.append(None)
+            last = match.end()
+        self.pieces.append(text[last:])
+        if not self.slots:
+            self.pieces = [text]
+
+    def render(self, words):
+        if not self.slots:
+            return self.pieces[0]
+        pieces = self.pieces.copy()
+        for position, index, encode in self.slots:
+            pieces[position] = encode(words[index]) if encode else words[index]
+        return "".join(pieces)
+
+class RequestTemplate:
+    """Target URL, headers and body parsed once into literal segments and numbered payload slots"""
+
+    def __init__(self, url, headers=None, data=None, encode=True):
+        headers = headers or {}
+        self.source = (headers, data, encode)
+        content_type = next((value for name, value in headers.items() if name.lower() == "content-type"), "")
+        self.data = None
+        if data is not None:
+            body_encoder = None
+            if encode and data.lstrip()[:1] in ("{", "["):
+                body_encoder = encode_json
+            elif encode and "x-www-form-urlencoded" in content_type.lower():
+                body_encoder = encode_form
+            self.data = Segments(data, BODY_SLOT_PATTERN, body_encoder and (lambda _: body_encoder))
+        self.headers = {name: value for name, value in headers.items() if not SLOT_PATTERN.search(value)}
+        self.header_slots = {
+            name: Segments(value, encoder=encode and (lambda _: encode_header))
+            for name, value in headers.items() if name not in self.headers
+        }
+
+        uses_slots = self.header_slots or (self.data and self.data.slots) or SLOT_PATTERN.search(url)
+        if not uses_slots:
+            # No keyword anywhere: the payload becomes the last path segment
+            url = f"{url.rstrip('/')}/FUZZ"
+        query_start = min((i for i in (url.find("?"), url.find("#")) if i >= 0), default=len(url))
+        self.target = url
+        self.url = Segments(url, encoder=encode and (lambda offset: encode_path if offset < query_start else encode_query))
+        self.path_slot = (
+            len(self.url.slots) == 1 and not self.header_slots and not (self.data and self.data.slots)
+            and SLOT_PATTERN.search(url).start() < query_start
+        )
+
+    @property
+    def wordlists_used(self):
+        """Zero-based wordlist indices referenced anywhere in the request"""
+        segments = [self.url] + list(self.header_slots.values()) + ([self.data] if self.data else [])
+        return {index for segment in segments for _, index, _ in segment.slots}
+
+    def descend(self, word):
+        """Template for the directory a hit names: its FUZZ becomes word/FUZZ (needs path_slot)"""
+        headers, data, encode = self.source
+        return RequestTemplate(self.url.render((f"{word}/FUZZ",)), headers, data, encode)
+
+    def build(self, item, headers):
+        """Render one request: (url, headers, data, payload display)"""
+        words = item if isinstance(item, tuple) else (item,)
+        if self.header_slots:
+            headers = dict(headers)
+            for name, segments in self.header_slots.items():
+                headers[name] = segments.render(words)
+        data = self.data.render(words) if self.data else None
+        return self.url.render(words), headers, data, " | ".join(words)
+
+def report_fuzz_response(args, results, url, data, payload_display, res, words=(), scan_target=None):
+    """Print a fuzzing response and record it if it passes the filters; returns True if it was recorded"""
+    status = res.status_code
+    content_length = res.size
+    should_display = args.response_filter.matches(status, content_length, res)
+    group = None
+    if should_display and args.response_index and (status != 404 or args.verbose):
+        should_display, group = args.response_index.admit(res, words)
+
+    color = (
+        Fore.YELLOW if status == 200 else
+        Fore.YELLOW if status in (201, 202, 204) else
+        Fore.YELLOW if status in (301, 302) else
+        Fore.RED if status == 403 else
+        Fore.MAGENTA if status >= 500 else
+        Fore.WHITE
+    )
+
+    if (status != 404 or args.verbose) and should_display:
+        target = f"{url} -> {res.url}" if res.history else url
+        line = f"[{status}] {target} [Size: {format_size(content_length)}]"
+
+        if args.verbose:
+            line = f"[{status}] {target} [Size: {format_size(content_length)}] [Payload: {payload_display}]"
+
+        results.echo(color + line)
+
+        if status != 404:
+            record = {
+                "payload": payload_display,
+                "url": url,
+                "status": status,
+                "size": content_length,
+                "data_sent": data
+            }
+            if scan_target:
+                record["target"] = scan_target
+            if res.history:
+                record["redirect_chain"] = res.history
+                record["final_url"] = res.url
+            if group is not None:
+                record["fingerprint"] = group.id
+                group.record = record
+            results.append(record)
+            return True
+    return False
+
+def calibrate(args, templates, results):
+    """--auto-calibrate: fingerprint responses to random payloads as baselines before the scan"""
+    index = args.response_index
+    arity = len(args.wordlist.split(',')) if args.wordlist else 1
+    alphabet = string.ascii_lowercase + string.digits
+    pool = ConnectionPool(args)
+    method, headers = apply_status_probe(args, args.method, templates[0].headers)
+    results.note(Fore.CYAN + f"[+] Calibrating with {len(CALIBRATION_SHAPES)} random payloads per target...")
+
+    def probe(template):
+        session = pool.session()
+        for shape in CALIBRATION_SHAPES:
+            words = tuple(
+                shape.format(*("".join(random.choices(alphabet, k=8)) for _ in range(shape.count("{}"))))
+                for _ in range(arity)
+            )
+            url, request_headers, data, _ = template.build(words, headers)
+            try:
+                res = fetch(args, session, method, url, request_headers, data)
+            except Exception as e:
+                if not args.quiet_errors:
+                    results.note(Fore.CYAN + f"[!] Calibration request to {url} failed: {e}")
+                continue
+            group, new = index.add_baseline(res, words)
+            if new:
+                results.note(Fore.BLUE + f"[~] Baseline {group.describe()}")
+
+    try:
+        with ThreadPoolExecutor(max_workers=min(args.threads, len(templates))) as executor:
+            list(executor.map(probe, templates))
+    finally:
+        pool.close()
+    index.calibrated = True
+
+def is_directory(url, res):
+    """A hit that names a directory: redirected to the same path plus '/', or already ending in '/'"""
+    path = urlsplit(url).path
+    if res.history:
+        return urlsplit(res.url).path == path + "/"
+    return path.endswith("/")
+
+def directory_rank(status):
+    """Scan order among directories of one depth: open ones before redirects before 401/403s"""
+    return 0 if 200 <= status < 300 else 1 if status < 400 else 2
+
+class Frontier:
+    """Directories found by --recursion-depth: a seen-set and the order they are scanned in"""
+
+    def __init__(self, max_depth, roots, words):
+        self.max_depth = max_depth
+        self.words = words  # callable returning a fresh iterator over the wordlist
+        self.lock = threading.Lock()
+        self.seen = {root.target for root in roots}
+        self.discovered = 0
+
+    def discover(self, job, item, url, res):
+        """The (priority, ScanJob) for the directory a recorded hit names, or None"""
+        if job.depth >= self.max_depth or not is_directory(url, res):
+            return None
+        child = job.template.descend(item)
+        with self.lock:
+            if child.target in self.seen:
+                return None
+            self.seen.add(child.target)
+            self.discovered += 1
+        # Shallower first, then open directories before redirects and 401/403s, then shorter paths
+        return (job.depth + 1, directory_rank(res.status_code), len(child.target)), ScanJob(child, job.depth + 1, job.target)
+
+    def summary(self):
+        return f"{self.discovered} directories found below the target(s)"
+
+class ScanJob:
+    """One wordlist pass against one request template"""
+
+    __slots__ = ("template", "depth", "target", "host")
+
+    def __init__(self, template, depth=0, target=None):
+        self.template = template
+        self.depth = depth
+        self.target = target  # the --targets-file entry results are tagged with
+        self.host = urlsplit(template.target).netloc.lower()
+
+class HostQueue:
+    """Pending passes and in-flight count of one host"""
+
+    __slots__ = ("passes", "ready", "in_flight", "limiter", "weight", "credit")
+
+    def __init__(self, limiter, weight):
+        self.passes = []
+        self.ready = None
+        self.in_flight = 0
+        self.limiter = limiter
+        self.weight = weight
+        self.credit = weight
+
+class HostScheduler:
+    """Fair payload stream across hosts for --targets-file, --recursion-depth and the --host-* limits
+
+    Every host has a heap of pending passes. Hosts take turns, `weight` payloads at a time; a host
+    at its --host-concurrency cap or out of --host-rate tokens is skipped, so the workers stay busy
+    with the others. When nothing is ready the stream waits, and it only ends once no probe is in
+    flight, since a running probe may still queue a directory.
+    """
+
+    def __init__(self, host_concurrency=0, host_rate=None, frontier=None):
+        self.host_concurrency = host_concurrency
+        self.host_rate = host_rate
+        self.frontier = frontier
+        self.lock = threading.Condition()
+        self.hosts = {}
+        self.ring = deque()
+        self.in_flight = 0
+        self.sequence = itertools.count()
+        self.wakeup = None
+
+    def add(self, job, entries, priority=(), weight=1):
+        """Queue a pass of (index, item) entries against job"""
+        with self.lock:
+            self._add(job, entries, priority, weight)
+            self.lock.notify_all()
+
+    def _add(self, job, entries, priority=(), weight=1):
+        host = self.hosts.get(job.host)
+        if host is None:
+            limiter = RateLimiter(self.host_rate) if self.host_rate else None
+            host = self.hosts[job.host] = HostQueue(limiter, weight)
+        host.weight = max(host.weight, weight)
+        if not host.passes and host.ready is None:
+            self.ring.append(host)
+        heapq.heappush(host.passes, (priority, next(self.sequence), job, iter(entries)))
+
+    def _next_entry(self, host):
+        if host.ready is not None:
+            entry, host.ready = host.ready, None
+            return entry
+        while host.passes:
+            _, _, job, entries = host.passes[0]
+            for index, item in entries:
+                return index, item, job
+            heapq.heappop(host.passes)
+        return None
+
+    def _take(self):
+        """Next (index, item, job) from a ready host; otherwise seconds to wait (None: until a probe
+        finishes), or END_OF_PAYLOADS once nothing is queued or in flight"""
+        wait = None
+        for _ in range(len(self.ring)):
+            if not self.ring:
+                break
+            host = self.ring[0]
+            if self.host_concurrency and host.in_flight >= self.host_concurrency:
+                self.ring.rotate(-1)
+                continue
+            entry = self._next_entry(host)
+            if entry is None:
+                self.ring.popleft()
+                continue
+            delay = host.limiter.try_acquire() if host.limiter else 0.0
+            if delay:
+                host.ready = entry
+                wait = delay if wait is None else min(wait, delay)
+                self.ring.rotate(-1)
+                continue
+            host.credit -= 1
+            if host.credit <= 0:
+                host.credit = host.weight
+                self.ring.rotate(-1)
+            host.in_flight += 1
+            self.in_flight += 1
+            return entry
+        if not self.ring and not self.in_flight:
+            return END_OF_PAYLOADS
+        return wait
+
+    def finish(self, job, item=None, url=None, hit=None):
+        """Account for one finished probe; pass the response of a recorded hit to recurse into it"""
+        found = self.frontier.discover(job, item, url, hit) if self.frontier and hit is not None else None
+        with self.lock:
+            if found:
+                priority, child = found
+                self._add(child, ((None, word) for word in self.frontier.words()), priority)
+            self.hosts[job.host].in_flight -= 1
+            self.in_flight -= 1
+            self.lock.notify_all()
+        if self.wakeup is not None:
+            self.wakeup.set()
+
+    def payloads(self):
+        """(index, item, job) for every queued pass, blocking while hosts are capped or probes run"""
+        while True:
+            with self.lock:
+                entry = self._take()
+                while not isinstance(entry, tuple):
+                    if entry is END_OF_PAYLOADS:
+                        return
+                    self.lock.wait(entry)
+                    entry = self._take()
+            yield entry
+
+    async def payloads_async(self):
+        """payloads() for the asyncio engine, which must not block the loop while it waits"""
+        self.wakeup = asyncio.Event()
+        while True:
+            with self.lock:
+                entry = self._take()
+            if entry is END_OF_PAYLOADS:
+                return
+            if isinstance(entry, tuple):
+                yield entry
+                continue
+            self.wakeup.clear()
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), entry)
+            except asyncio.TimeoutError:
+                pass
+
+def fuzz_worker(queue, args, results, pool, throttle, checkpoint, scheduler=None):
+    """Worker function for endpoint fuzzing"""
+    session = pool.session()
+    method, headers = apply_status_probe(args, args.method, args.request_template.headers)
+    while True:
+        item = queue.get()
+        if item is END_OF_PAYLOADS:
+            queue.task_done()
+            break
+        index, item, job = item
+        if not item:
+            checkpoint.done(index)
+            if scheduler:
+                scheduler.finish(job)
+            queue.task_done()
+            continue
+
+        template = job.template if job else args.request_template
+        url, request_headers, data, payload_display = template.build(item, headers)
+        words = item if isinstance(item, tuple) else (item,)
+        hit = None
+
+        try:
+            res = throttle.call(fetch, args, session, method, url, request_headers, data)
+            if report_fuzz_response(args, results, url, data, payload_display, res, words, job and job.target):
+                hit = res
+
+        except Exception as e:
+            if not args.quiet_errors:
+                results.echo(Fore.CYAN + f"[!] Error on '{payload_display}': {e}")
+        finally:
+            checkpoint.done(index)
+            if scheduler:
+                scheduler.finish(job, item, url, hit)
+            queue.task_done()
+
+        if args.delay:
+            time.sleep(args.delay)
+
+# Seconds a single DNS query may take across retries on one nameserver
+DNS_TIMEOUT = 3.0
+
+# Random labels resolved under each parent domain to detect wildcard DNS
+WILDCARD_PROBES = 2
+
+class SubdomainResolver:
+    """Caching A-record resolver with nameserver round-robin and per-parent wildcard detection"""
+
+    def __init__(self, args):
+        import dns.resolver  # Imported here so endpoint-only runs never load dnspython
+        self.telemetry = args.telemetry
+        self.nameservers = [ns.strip() for ns in (args.resolvers or "").split(',') if ns.strip()]
+        self.resolvers = self._build(dns.resolver.Resolver)
+        self.negative = (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer, dns.resolver.YXDOMAIN)
+        self.async_resolvers = None
+        self.cache = {}      # name -> tuple of IPs, or None for NXDOMAIN/no A record
+        self.wildcards = {}  # parent domain -> frozenset of catch-all IPs
+        self.lock = threading.Lock()
+        self.wildcard_locks = {}  # parent domain -> lock held while its wildcard is detected
+        self.wildcard_tasks = {}
+        self.turn = 0
+        self.stats = {"resolved": 0, "nxdomain": 0, "failed": 0, "wildcard": 0, "cache_hits": 0}
+
+    def _build(self, resolver_cls):
+        if not self.nameservers:
+            resolvers = [resolver_cls()]
+        else:
+            resolvers = []
+            for nameserver in self.nameservers:
+                address, port = self._parse_nameserver(nameserver)
+                resolver = resolver_cls(configure=False)
+                resolver.nameservers = [address]
+                resolver.port = port
+                resolvers.append(resolver)
+        for resolver in resolvers:
+            resolver.lifetime = DNS_TIMEOUT
+            resolver.cache = None  # our own cache also remembers negative answers
+        return resolvers
+
+    @staticmethod
+    def _parse_nameserver(nameserver):
+        """Split '1.1.1.1', '127.0.0.1:5353' or '[::1]:5353' into address and port"""
+        if nameserver.startswith('['):
+            address, _, port = nameserver[1:].partition(']')
+            return address, int(port.lstrip(':') or 53)
+        if nameserver.count(':') == 1:
+            address, port = nameserver.split(':')
+            return address, int(port)
+        return nameserver, 53
+
+    def _rotation(self, resolvers):
+        """Resolvers in round-robin order, starting one further along on every call"""
+        with self.lock:
+            start = self.turn
+            self.turn += 1
+        return [resolvers[(start + i) % len(resolvers)] for i in range(len(resolvers))]
+
+    def _cached(self, name):
+        with self.lock:
+            if name in self.cache:
+                self.stats["cache_hits"] += 1
+                return True, self.cache[name]
+        return False, None
+
+    def _store(self, name, ips, definitive):
+        with self.lock:
+            if definitive:
+                self.cache[name] = ips
+            self.stats["resolved" if ips else "nxdomain" if definitive else "failed"] += 1
+        return ips
+
+    def resolve(self, name):
+        """Return the A records of name as a tuple, or None if it does not resolve"""
+        name = name.partition(':')[0]  # tolerate host:port targets
+        hit, ips = self._cached(name)
+        if hit:
+            return ips
+        started = time.monotonic()
+        try:
+            for resolver in self._rotation(self.resolvers):
+                try:
+                    answers = resolver.resolve(name, 'A')
+                    return self._store(name, tuple(str(rdata) for rdata in answers), True)
+                except self.negative:
+                    return self._store(name, None, True)
+                except Exception:
+                    continue  # Timeout or unusable nameserver, try the next one
+            return self._store(name, None, False)
+        finally:
+            self.telemetry.observe("dns", time.monotonic() - started)
+
+    async def resolve_async(self, name):
+        """Asyncio twin of resolve() sharing the same cache and rotation"""
+        name = name.partition(':')[0]
+        hit, ips = self._cached(name)
+        if hit:
+            return ips
+        if self.async_resolvers is None:
+            from dns import asyncresolver
+            self.async_resolvers = self._build(asyncresolver.Resolver)
+        started = time.monotonic()
+        try:
+            for resolver in self._rotation(self.async_resolvers):
+                try:
+                    answers = await resolver.resolve(name, 'A')
+                    return self._store(name, tuple(str(rdata) for rdata in answers), True)
+                except self.negative:
+                    return self._store(name, None, True)
+                except Exception:
+                    continue
+            return self._store(name, None, False)
+        finally:
+            self.telemetry.observe("dns", time.monotonic() - started)
+
+    def _wildcard_names(self, parent):
+        alphabet = string.ascii_lowercase + string.digits
+        return [f"{''.join(random.choices(alphabet, k=16))}.{parent}" for _ in range(WILDCARD_PROBES)]
+
+    def _is_wildcard(self, name, ips, wildcard_ips):
+        if wildcard_ips and set(ips) <= wildcard_ips:
+            with self.lock:
+                self.stats["wildcard"] += 1
+            return True
+        return False
+
+    def lookup(self, name):
+        """Resolve name; returns (ips or None, True if the answer is just the parent's wildcard)"""
+        ips = self.resolve(name)
+        if not ips:
+            return ips, False
+        parent = name.split('.', 1)[1]
+        if parent not in self.wildcards:
+            # One detection per parent; concurrent lookups under the same parent wait for it, others don't
+            with self.lock:
+                parent_lock = self.wildcard_locks.setdefault(parent, threading.Lock())
+            with parent_lock:
+                if parent not in self.wildcards:
+                    found = set()
+                    for probe in self._wildcard_names(parent):
+                        found.update(self.resolve(probe) or ())
+                    self.wildcards[parent] = frozenset(found)
+        return ips, self._is_wildcard(name, ips, self.wildcards[parent])
+
+    async def lookup_async(self, name):
+        """Asyncio twin of lookup()"""
+        ips = await self.resolve_async(name)
+        if not ips:
+            return ips, False
+        parent = name.split('.', 1)[1]
+        if parent not in self.wildcards:
+            # One detection per parent; concurrent lookups wait on the same task
+            task = self.wildcard_tasks.get(parent)
+            if task is None:
+                task = asyncio.ensure_future(self._detect_wildcard_async(parent))
+                self.wildcard_tasks[parent] = task
+            await task
+        return ips, self._is_wildcard(name, ips, self.wildcards[parent])
+
+    async def _detect_wildcard_async(self, parent):
+        found = set()
+        for probe in self._wildcard_names(parent):
+            found.update(await self.resolve_async(probe) or ())
+        self.wildcards[parent] = frozenset(found)
+
+    def summary(self):
+        stats = self.stats
+        return (f"{stats['resolved']} resolved, {stats['nxdomain']} NXDOMAIN, {stats['failed']} failed, "
+                f"{stats['wildcard']} wildcard, {stats['cache_hits']} cache hits")
+
+def iter_bounded(executor, fn, items, window):
+    """Map fn over items on an executor with at most `window` calls in flight, yielding results as they finish"""
+    pending = set()
+    for item in items:
+        pending.add(executor.submit(fn, item))
+        if len(pending) >= window:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    for future in as_completed(pending):
+        yield future.result()
+
+def dns_outcome(args, results, full_domain, ips, wildcard, seen_ips):
+    """Report a DNS answer and decide whether the host should be probed over HTTP"""
+    if not ips:
+        return args.probe_unresolved
+    if wildcard:
+        if args.verbose:
+            results.echo(Fore.WHITE + f"[DNS] {full_domain} -> {', '.join(ips)} (wildcard, skipped)")
+        return False
+    report_dns_result(results, full_domain, list(ips), target_domain(args, full_domain))
+    if args.dedup_ip:
+        key = frozenset(ips)
+        if key in seen_ips:
+            return False
+        seen_ips.add(key)
+    return True
+
+def resolve_subdomains(args, resolver, names, results, checkpoint):
+    """DNS stage: resolve (index, name) pairs concurrently and yield (index, name, ips) for the hosts worth probing over HTTP"""
+    seen_ips = set()
+
+    def lookup(item):
+        return item + resolver.lookup(item[1])
+
+    with ThreadPoolExecutor(max_workers=args.dns_concurrency) as executor:
+        for index, full_domain, ips, wildcard in iter_bounded(executor, lookup, names, args.dns_concurrency * 2):
+            if dns_outcome(args, results, full_domain, ips, wildcard, seen_ips):
+                yield index, full_domain, ips
+            else:
+                checkpoint.done(index)
+
+def subdomain_protocols(args):
+    """Schemes to probe for each subdomain, in order"""
+    protocols = ['https', 'http'] if not args.no_https else ['http']
+    if args.force_https:
+        protocols = ['https']
+    return protocols
+
+class Reachability:
+    """Schemes that failed to connect, per IP set, shared by every subdomain on the same address"""
+
+    def __init__(self):
+        self.down = set()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(full_domain, ips):
+        host, _, port = full_domain.partition(':')
+        return (tuple(sorted(ips)) if ips else host, port)
+
+    def is_down(self, key, scheme):
+        with self.lock:
+            return (key, scheme) in self.down
+
+    def mark_down(self, key, scheme):
+        with self.lock:
+            self.down.add((key, scheme))
+
+def is_connect_failure(e):
+    """True when the TCP connection itself failed, as opposed to TLS or the HTTP exchange"""
+    if isinstance(e, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(e, requests.exceptions.SSLError) or not isinstance(e, requests.exceptions.ConnectionError):
+        return False
+    reason = e.args[0] if e.args else None
+    reason = getattr(reason, "reason", reason)
+    return isinstance(reason, (NewConnectionError, ConnectionRefusedError))
+
+def probe_schemes(args, full_domain, ips, reachability, fetch_url, executor):
+    """Probe a host's schemes under --scheme-policy, yielding (url, response or None) in reporting order"""
+    key = Reachability.key(full_domain, ips)
+    schemes = [scheme for scheme in subdomain_protocols(args) if not reachability.is_down(key, scheme)]
+
+    def attempt(scheme):
+        url = f"{scheme}://{full_domain}"
+        try:
+            return url, fetch_url(url)
+        except requests.exceptions.RequestException as e:
+            if is_connect_failure(e):
+                reachability.mark_down(key, scheme)
+            return url, None
 
-{Style.RESET_ALL}
-    """
-    print(banner)
+    if args.scheme_policy == "sequential" or len(schemes) < 2:
+        for scheme in schemes:
+            yield attempt(scheme)
+        return
 
-def load_wordlists(wordlist_args):
-    """Load multiple wordlists and return a list of combinations"""
-    wordlists = []
-    wordlist_files = wordlist_args.split(',')
-    
-    for i, wordlist_file in enumerate(wordlist_files):
+    # Race the schemes so a filtered port costs one timeout instead of stacking with the next
+    futures = [executor.submit(attempt, scheme) for scheme in schemes]
+    for future in (as_completed(futures) if args.scheme_policy == "first" else futures):
+        yield future.result()
+
+async def probe_schemes_async(args, full_domain, ips, reachability, client, throttle, method, headers):
+    """Asyncio twin of probe_schemes()"""
+    key = Reachability.key(full_domain, ips)
+    schemes = [scheme for scheme in subdomain_protocols(args) if not reachability.is_down(key, scheme)]
+
+    async def attempt(scheme):
+        url = f"{scheme}://{full_domain}"
         try:
-            with open(wordlist_file.strip(), "r", encoding="utf-8", errors="ignore") as f:
-                words = [line.strip() for line in f if line.strip()]
-            wordlists.append(words)
-            print(Fore.GREEN + f"[+] Loaded wordlist {i+1}: {wordlist_file.strip()} ({len(words)} words)")
-        except FileNotFoundError:
-            print(Fore.RED + f"[-] Error: Wordlist file '{wordlist_file}' not found")
-            sys.exit(1)
-        except Exception as e:
-            print(Fore.RED + f"[-] Error reading wordlist '{wordlist_file}': {e}")
-            sys.exit(1)
-    
-    # Generate all combinations
-    combinations = list(itertools.product(*wordlists))
-    return combinations
+            return url, await throttle.call_async(client.request, method, url, headers, allow_redirects=True)
+        except requests.exceptions.RequestException as e:
+            if is_connect_failure(e):
+                reachability.mark_down(key, scheme)
+            return url, None
 
-def should_display_response(args, status, content_length, response_text):
-    """Check if response should be displayed based on filters"""
-    if args.filter_status:
-        status_codes = []
-        for status_range in args.filter_status.split(','):
-            if '-' in status_range:
-                start, end = map(int, status_range.split('-'))
-                status_codes.extend(range(start, end + 1))
-            else:
-                status_codes.append(int(status_range))
-        if status not in status_codes:
-            return False
-    
-    if args.filter_size:
-        size_ranges = args.filter_size.split(',')
-        size_match = False
-        for size_range in size_ranges:
-            if '-' in size_range:
-                min_size, max_size = map(int, size_range.split('-'))
-                if min_size <= content_length <= max_size:
-                    size_match = True
-                    break
-            elif size_range.startswith('>'):
-                min_size = int(size_range[1:])
-                if content_length > min_size:
-                    size_match = True
-                    break
-            elif size_range.startswith('<'):
-                max_size = int(size_range[1:])
-                if content_length < max_size:
-                    size_match = True
-                    break
-            else:
-                exact_size = int(size_range)
-                if content_length == exact_size:
-                    size_match = True
-                    break
-        if not size_match:
-            return False
-    
-    if args.filter_content:
-        patterns = args.filter_content.split(',')
-        for pattern in patterns:
-            if re.search(pattern, response_text, re.IGNORECASE):
-                return True
+    if args.scheme_policy == "sequential" or len(schemes) < 2:
+        for scheme in schemes:
+            yield await attempt(scheme)
+        return
+
+    tasks = [asyncio.ensure_future(attempt(scheme)) for scheme in schemes]
+    try:
+        for task in (asyncio.as_completed(tasks) if args.scheme_policy == "first" else tasks):
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
+
+def target_domain(args, full_domain):
+    """The --targets-file domain a generated name belongs to (the longest matching suffix), or None"""
+    if not args.targets:
+        return None
+    labels = full_domain.split(".")
+    for i in range(1, len(labels)):
+        suffix = ".".join(labels[i:])
+        if suffix in args.target_domains:
+            return suffix
+    return None
+
+def report_dns_result(results, full_domain, ip_addresses, target=None):
+    """Print and record a resolved subdomain"""
+    results.echo(Fore.YELLOW + f"[DNS] {full_domain} -> {', '.join(ip_addresses)}")
+    record = {
+        "subdomain": full_domain,
+        "ip_addresses": ip_addresses,
+        "method": "DNS"
+    }
+    if target:
+        record["target"] = target
+    results.append(record)
+
+def report_subdomain_response(args, results, full_domain, url, res):
+    """Print and record an HTTP hit for a subdomain; returns True if it was recorded or matched a known fingerprint"""
+    status = res.status_code
+    content_length = res.size
+    if not args.response_filter.matches(status, content_length, res):
         return False
-    
-    if args.exclude_content:
-        patterns = args.exclude_content.split(',')
-        for pattern in patterns:
-            if re.search(pattern, response_text, re.IGNORECASE):
-                return False
-    
+    group = None
+    if args.response_index:
+        admitted, group = args.response_index.admit(res, (full_domain,))
+        if not admitted:
+            return True
+
+    color = (
+        Fore.YELLOW if status == 200 else
+        Fore.YELLOW if status in (301, 302) else
+        Fore.WHITE
+    )
+    target = f"{url} -> {res.url}" if res.history else url
+    results.echo(f"{color}[{status}] {target} [Size: {format_size(content_length)}]")
+
+    record = {
+        "subdomain": full_domain,
+        "url": url,
+        "status": status,
+        "size": content_length,
+        "method": "HTTP"
+    }
+    domain = target_domain(args, full_domain)
+    if domain:
+        record["target"] = domain
+    if res.history:
+        record["redirect_chain"] = res.history
+        record["final_url"] = res.url
+    if group is not None:
+        record["fingerprint"] = group.id
+        group.record = record
+    results.append(record)
     return True
 
-def fuzz_worker(queue, args, results):
-    """Worker function for endpoint fuzzing"""
-    while not queue.empty():
+def subdomain_worker(queue, args, results, pool, throttle, reachability, executor, checkpoint):
+    """Worker function for subdomain enumeration: HTTP probes for hosts that passed the DNS stage"""
+    method, headers = apply_status_probe(args, "GET", {})
+
+    def fetch_url(url):
+        # Runs on whichever thread probes the scheme, so it uses that thread's session
+        return throttle.call(fetch, args, pool.session(), method, url, headers, verify=False)
+
+    while True:
         item = queue.get()
+        if item is END_OF_PAYLOADS:
+            queue.task_done()
+            break
+        index, full_domain, ips = item
         
-        if isinstance(item, tuple):
-            word_combinations = item
-            if "FUZZ" in args.target:
-                url = args.target.replace("FUZZ", word_combinations[0])
-            elif args.data:
-                url = args.target
-                data = args.data
-                for i, word in enumerate(word_combinations):
-                    placeholder = f"wordlist_{i+1}"
-                    data = data.replace(placeholder, word)
+        try:
+            # Try HTTP/HTTPS requests
+            for url, res in probe_schemes(args, full_domain, ips, reachability, fetch_url, executor):
+                if res is not None and report_subdomain_response(args, results, full_domain, url, res):
+                    break  # Found via HTTP, no need to try other protocols
+                    
+        except Exception as e:
+            if not args.quiet_errors:
+                results.echo(Fore.CYAN + f"[!] Error checking {full_domain}: {e}")
+        finally:
+            checkpoint.done(index)
+            queue.task_done()
+
+        if args.delay:
+            time.sleep(args.delay)
+
+class AsyncHTTPClient:
+    """Stdlib-only asyncio HTTP/1.1 client with keep-alive connection pooling per host"""
+
+    def __init__(self, args, verify=True):
+        self.args = args
+        self.connect_timeout = args.connect_timeout
+        self.read_timeout = args.read_timeout
+        self.retries = args.retries
+        self.pool_size = args.max_host_connections or args.pool_size or args.concurrency
+        self.host_limit = args.max_host_connections
+        self.host_slots = {}
+        self.stats = ConnectionStats()
+        self.idle = {}
+        self.addresses = {}
+        # Name lookups get their own pool so slow NXDOMAINs can't starve the loop's default executor
+        self.resolver_pool = ThreadPoolExecutor(max_workers=64)
+        self.ssl_context = ssl.create_default_context()
+        if not verify:
+            self.ssl_context.check_hostname = False
+            self.ssl_context.verify_mode = ssl.CERT_NONE
+
+    async def request(self, method, url, headers=None, data=None, allow_redirects=False):
+        """Send a request, following redirects without downloading hop bodies when asked"""
+        history = []
+        for _ in range(MAX_REDIRECTS + 1):
+            parts = urlsplit(requests.utils.requote_uri(url))
+            if parts.scheme.lower() not in ("http", "https"):
+                raise requests.exceptions.InvalidSchema(f"Unsupported scheme: {parts.scheme}")
+            address = await self._resolve(parts)
+            slot = self._host_slot(parts, address)
+            if slot is not None:
+                await slot.acquire()
+            try:
+                res = await self._send(method, url, parts, address, headers or {}, data, allow_redirects)
+            finally:
+                if slot is not None:
+                    slot.release()
+            location = res.headers.get("location")
+            if not allow_redirects or res.status_code not in REDIRECT_STATUSES or not location:
+                res.history = history
+                return res
+            history.append({"status": res.status_code, "url": url})
+            method, data, next_url = next_hop(method, data, url, res.status_code, location)
+            headers, url = hop_headers(headers, url, next_url), next_url
+        raise requests.exceptions.TooManyRedirects(f"Exceeded {MAX_REDIRECTS} redirects from {url}")
+
+    def _host_slot(self, parts, address):
+        """Semaphore holding a host to --max-host-connections requests (and so connections) at once, or None"""
+        if not self.host_limit:
+            return None
+        key = (parts.scheme.lower(), parts.hostname, address)
+        slot = self.host_slots.get(key)
+        if slot is None:
+            slot = self.host_slots[key] = asyncio.Semaphore(self.host_limit)
+        return slot
+
+    async def _resolve(self, parts):
+        """Resolve a URL's host once and share the answer between requests"""
+        port = parts.port or (443 if parts.scheme.lower() == "https" else 80)
+        key = (parts.hostname, port)
+        future = self.addresses.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self.resolver_pool, self._lookup, parts.hostname, port)
+            self.addresses[key] = future
+        try:
+            infos = await asyncio.shield(future)
+        except Exception as e:
+            # Only answers are shared; a failed lookup is dropped so the next request asks again
+            if self.addresses.get(key) is future:
+                del self.addresses[key]
+            if isinstance(e, socket.gaierror):
+                raise requests.exceptions.ConnectionError(f"Failed to resolve {parts.hostname}: {e}") from e
+            raise
+        return infos[0][4][0], port
+
+    def _lookup(self, host, port):
+        started = time.monotonic()
+        try:
+            return socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+        finally:
+            self.args.telemetry.observe("dns", time.monotonic() - started)
+
+    async def _send(self, method, url, parts, address, headers, data, following):
+        scheme = parts.scheme.lower()
+        key = (scheme, parts.hostname, address)
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+
+        body = data.encode("utf-8") if isinstance(data, str) else data
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {parts.netloc.rsplit('@', 1)[-1]}"]
+        default_headers = {
+            "User-Agent": "fuzzhound",
+            "Accept-Encoding": "gzip, deflate",
+            "Accept": "*/*",
+            "Connection": "keep-alive",
+        }
+        default_headers.update(headers)
+        lines.extend(f"{k}: {v}" for k, v in default_headers.items())
+        if body is not None:
+            lines.append(f"Content-Length: {len(body)}")
+        payload = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1", errors="replace") + (body or b"")
+
+        attempt = 0
+        while True:
+            try:
+                reader, writer, reused = await self._acquire(key)
+            except requests.exceptions.SSLError:
+                raise
+            except requests.exceptions.ConnectionError:
+                if attempt < self.retries:
+                    attempt += 1
+                    continue
+                raise
+            try:
+                status, res_headers, content, complete, known_length, keep_alive = await asyncio.wait_for(
+                    self._exchange(reader, writer, payload, method, following), self.read_timeout
+                )
+            except asyncio.TimeoutError:
+                writer.close()
+                raise requests.exceptions.ReadTimeout(f"Read timed out after {self.read_timeout}s: {url}") from None
+            except (ConnectionError, asyncio.IncompleteReadError, OSError) as e:
+                writer.close()
+                # A pooled keep-alive connection may have been closed by the server meanwhile; a fresh
+                # one failing mid-exchange is a read error, and the request may already have been handled
+                if reused:
+                    continue
+                raise requests.exceptions.ConnectionError(str(e) or type(e).__name__) from e
+            except BaseException:
+                writer.close()
+                raise
+            if keep_alive:
+                self._release(key, reader, writer)
             else:
-                url = f"{args.target.rstrip('/')}/{word_combinations[0]}"
-            payload_display = " | ".join(word_combinations)
+                writer.close()
+            return make_response(self.args, url, status, res_headers, content, complete, known_length)
+
+    async def _acquire(self, key):
+        idle = self.idle.get(key)
+        while idle:
+            reader, writer = idle.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                self.stats.record(reused=True)
+                return reader, writer, True
+            writer.close()
+        scheme, host, (ip, port) = key
+        ssl_context = self.ssl_context if scheme == "https" else None
+        try:
+            reader, writer = await asyncio.wait_for(self._open(host, ip, port, ssl_context), self.connect_timeout)
+        except asyncio.TimeoutError:
+            raise requests.exceptions.ConnectTimeout(f"Connection to {host}:{port} timed out") from None
+        except ssl.SSLError as e:
+            raise requests.exceptions.SSLError(str(e)) from e
+        except OSError as e:
+            raise requests.exceptions.ConnectionError(
+                NewConnectionError(None, f"Failed to connect to {host}:{port}: {e}")
+            ) from e
+        self.stats.record(reused=False)
+        return reader, writer, False
+
+    async def _open(self, host, ip, port, ssl_context):
+        """Open a connection, timing TCP and TLS separately where StreamWriter.start_tls exists (3.11+)"""
+        telemetry = self.args.telemetry
+        started = time.monotonic()
+        if ssl_context is None or not hasattr(asyncio.StreamWriter, "start_tls"):
+            reader, writer = await asyncio.open_connection(
+                ip, port, ssl=ssl_context, server_hostname=host if ssl_context else None, limit=2 ** 20
+            )
+            telemetry.observe("connect", time.monotonic() - started)
+            return reader, writer
+        reader, writer = await asyncio.open_connection(ip, port, limit=2 ** 20)
+        connected = time.monotonic()
+        telemetry.observe("connect", connected - started)
+        try:
+            await writer.start_tls(ssl_context, server_hostname=host)
+        except BaseException:
+            writer.close()
+            raise
+        telemetry.observe("tls", time.monotonic() - connected)
+        return reader, writer
+
+    def _release(self, key, reader, writer):
+        idle = self.idle.setdefault(key, [])
+        if len(idle) < self.pool_size:
+            idle.append((reader, writer))
         else:
-            word = item
-            if not word:
-                queue.task_done()
-                continue
-                
-            if "FUZZ" in args.target:
-                url = args.target.replace("FUZZ", word)
-            elif args.data and "FUZZ" in args.data:
-                url = args.target
-                data = args.data.replace("FUZZ", word)
-            else:
-                url = f"{args.target.rstrip('/')}/{word}"
-            payload_display = word
+            writer.close()
+
+    async def _exchange(self, reader, writer, payload, method, following):
+        sent = time.monotonic()
+        writer.write(payload)
+        await writer.drain()
+        return await self._read_response(reader, method, following, sent)
+
+    async def _read_response(self, reader, method, following, sent):
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Connection closed before response")
+        version, status = status_line.decode("latin-1").split(None, 2)[:2]
+        status = int(status)
 
         headers = {}
-        if args.headers:
-            for h in args.headers.split(","):
-                if ":" in h:
-                    k, v = h.split(":", 1)
-                    headers[k.strip()] = v.strip()
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        # Skip interim 1xx responses
+        if 100 <= status < 200:
+            return await self._read_response(reader, method, following, sent)
+        headers_read = time.monotonic()
+        self.args.telemetry.observe("ttfb", headers_read - sent)
+
+        keep_alive = version.upper() == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+        hop = following and status in REDIRECT_STATUSES and "location" in headers
+        known_length, limit = body_read_limit(self.args, headers, method, hop)
+        content = b""
+        complete = True
+        if status in (204, 304):
+            pass
+        elif method == "HEAD":
+            # Sized from Content-Length like a skipped body; without one the size is unknown
+            complete = False
+        elif limit == 0:
+            # Body not needed and too large to drain: drop the connection instead of downloading it
+            complete = known_length == 0
+            keep_alive = keep_alive and complete
+        elif "chunked" in headers.get("transfer-encoding", "").lower():
+            chunks = []
+            total = 0
+            while True:
+                size = int((await reader.readline()).split(b";")[0].strip() or b"0", 16)
+                if size == 0:
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+                total += size
+                if limit is not None and total > limit:
+                    complete = keep_alive = False
+                    break
+            content = b"".join(chunks)
+        elif "content-length" in headers:
+            length = int(headers["content-length"])
+            if limit is not None and length > limit:
+                length = limit
+                complete = keep_alive = False
+            content = await reader.readexactly(length)
+        else:
+            # No framing: the body runs until the server closes the connection
+            chunks = []
+            total = 0
+            while True:
+                chunk = await reader.read(16 * 1024)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                total += len(chunk)
+                if limit is not None and total > limit:
+                    complete = False
+                    break
+            content = b"".join(chunks)
+            keep_alive = False
+
+        encoding = headers.get("content-encoding", "").lower()
+        if encoding in ("gzip", "deflate") and content:
+            wbits = 16 + zlib.MAX_WBITS if encoding == "gzip" else zlib.MAX_WBITS
+            try:
+                content = zlib.decompressobj(wbits).decompress(content)
+            except zlib.error:
+                content = zlib.decompressobj(-zlib.MAX_WBITS).decompress(content)
+        if limit:
+            complete = complete and len(content) <= limit
+            content = content[:limit]
+        self.args.telemetry.observe("body", time.monotonic() - headers_read)
+        return status, headers, content, complete, known_length, keep_alive
+
+    async def close(self):
+        for idle in self.idle.values():
+            for _, writer in idle:
+                writer.close()
+        self.idle = {}
+        self.resolver_pool.shutdown(wait=False, cancel_futures=True)
+
 
+def raise_fd_limit():
+    """Raise the soft open-file limit so thousands of sockets can be in flight"""
+    try:
+        import resource
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if hard == resource.RLIM_INFINITY or hard > soft:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (hard if hard != resource.RLIM_INFINITY else 65535, hard))
+    except (ImportError, ValueError, OSError):
+        pass
+
+async def run_bounded(items, handler, concurrency, cancel=None):
+    """Run handler(item) for every item of a plain or async iterable with at most `concurrency` in flight, until `cancel` is set"""
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks = set()
+
+    async def run(item):
         try:
-            if args.data:
-                if isinstance(item, tuple):
-                    pass
-                else:
-                    data = args.data.replace("FUZZ", word)
-                
-                res = requests.request(args.method, url, headers=headers, data=data, timeout=5)
-            else:
-                res = requests.request(args.method, url, headers=headers, timeout=5)
-
-            status = res.status_code
-            content_length = len(res.content)
-            response_text = res.text
-            
-
-            should_display = should_display_response(args, status, content_length, response_text)
-            
-
-            color = (
-                Fore.YELLOW if status == 200 else
-                Fore.YELLOW if status in (201, 202, 204) else
-                Fore.YELLOW if status in (301, 302) else
-                Fore.RED if status == 403 else
-                Fore.MAGENTA if status >= 500 else
-                Fore.WHITE
-            )
+            await handler(item)
+        finally:
+            semaphore.release()
+
+    async def submit(item):
+        await semaphore.acquire()
+        task = asyncio.ensure_future(run(item))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            if cancel and cancel.is_set():
+                break
+            await submit(item)
+    else:
+        for item in items:
+            if cancel and cancel.is_set():
+                break
+            await submit(item)
+
+    if tasks:
+        await asyncio.gather(*tasks)
 
-            if (status != 404 or args.verbose) and should_display:
-                line = f"[{status}] {url} [Size: {content_length}]"
-                
-                if args.verbose:
-                    line = f"[{status}] {url} [Size: {content_length}] [Payload: {payload_display}]"
-                
-                print(color + line)
-
-                if status != 404:
-                    results.append({
-                        "payload": payload_display, 
-                        "url": url, 
-                        "status": status,
-                        "size": content_length,
-                        "data_sent": data if args.data else None
-                    })
+async def async_fuzz(args, payloads, results, throttle, checkpoint, transport=None, scheduler=None):
+    """Endpoint fuzzing on the asyncio engine; returns the transport's connection stats"""
+    client = transport or AsyncHTTPClient(args)
+    method, headers = apply_status_probe(args, args.method, args.request_template.headers)
 
+    async def probe(entry):
+        index, item, job = entry
+        if not item:
+            checkpoint.done(index)
+            if scheduler:
+                scheduler.finish(job)
+            return
+        template = job.template if job else args.request_template
+        url, request_headers, data, payload_display = template.build(item, headers)
+        words = item if isinstance(item, tuple) else (item,)
+        hit = None
+        try:
+            res = await throttle.call_async(client.request, method, url, request_headers, data, allow_redirects=True)
+            if report_fuzz_response(args, results, url, data, payload_display, res, words, job and job.target):
+                hit = res
         except Exception as e:
             if not args.quiet_errors:
-                print(Fore.CYAN + f"[!] Error on '{payload_display}': {e}")
+                results.echo(Fore.CYAN + f"[!] Error on '{payload_display}': {e or type(e).__name__}")
         finally:
-            queue.task_done()
+            checkpoint.done(index)
+            if scheduler:
+                scheduler.finish(job, item, url, hit)
 
         if args.delay:
-            time.sleep(args.delay)
+            await asyncio.sleep(args.delay)
 
-def subdomain_worker(queue, args, results, domain):
-    """Worker function for subdomain enumeration"""
-    while not queue.empty():
-        subdomain = queue.get()
-        if not subdomain:
-            queue.task_done()
-            continue
-            
-        full_domain = f"{subdomain}.{domain}"
-        
+    try:
+        await run_bounded(payloads, probe, args.concurrency, args.cancel)
+    finally:
+        await client.close()
+    return client.stats
+
+async def async_enumerate(args, names, results, throttle, checkpoint, resolver=None, transport=None):
+    """Subdomain enumeration on the asyncio engine; returns the transport's connection stats"""
+    client = transport or AsyncHTTPClient(args, verify=False)
+    method, headers = apply_status_probe(args, "GET", {})
+    dns_slots = asyncio.Semaphore(args.dns_concurrency)
+    seen_ips = set()
+    reachability = Reachability()
+
+    async def probe(pair):
+        index, full_domain = pair
         try:
-            # Try DNS resolution first
-            if not args.skip_dns:
-                try:
-                    answers = dns.resolver.resolve(full_domain, 'A')
-                    ip_addresses = [str(rdata) for rdata in answers]
-                    print(Fore.YELLOW + f"[DNS] {full_domain} -> {', '.join(ip_addresses)}")
-                    results.append({
-                        "subdomain": full_domain,
-                        "ip_addresses": ip_addresses,
-                        "method": "DNS"
-                    })
-                except:
-                    pass  # DNS resolution failed, try HTTP
+            ips = None
+            if resolver is not None:
+                async with dns_slots:
+                    ips, wildcard = await resolver.lookup_async(full_domain)
+                if not dns_outcome(args, results, full_domain, ips, wildcard, seen_ips):
+                    checkpoint.done(index)
+                    return
 
-            # Try HTTP/HTTPS requests
-            protocols = ['https', 'http'] if not args.no_https else ['http']
-            if args.force_https:
-                protocols = ['https']
-            
-            for protocol in protocols:
-                url = f"{protocol}://{full_domain}"
-                try:
-                    res = requests.get(url, timeout=5, allow_redirects=True, verify=False)
-                    status = res.status_code
-                    content_length = len(res.content)
-                    
-                    should_display = should_display_response(args, status, content_length, res.text)
-                    
-                    if should_display:
-                        color = (
-                            Fore.YELLOW if status == 200 else
-                            Fore.YELLOW if status in (301, 302) else
-                            Fore.WHITE
-                        )
-                        print(f"{color}[{status}] {url} [Size: {content_length}]")
-                        
-                        results.append({
-                            "subdomain": full_domain,
-                            "url": url,
-                            "status": status,
-                            "size": content_length,
-                            "method": "HTTP"
-                        })
+            probes = probe_schemes_async(args, full_domain, ips, reachability, client, throttle, method, headers)
+            try:
+                async for url, res in probes:
+                    if res is not None and report_subdomain_response(args, results, full_domain, url, res):
                         break  # Found via HTTP, no need to try other protocols
-                        
-                except requests.exceptions.RequestException:
-                    continue  # Try next protocol
-                    
+            finally:
+                await probes.aclose()
+
         except Exception as e:
             if not args.quiet_errors:
-                print(Fore.CYAN + f"[!] Error checking {full_domain}: {e}")
-        finally:
-            queue.task_done()
+                results.echo(Fore.CYAN + f"[!] Error checking {full_domain}: {e}")
+        checkpoint.done(index)
 
         if args.delay:
-            time.sleep(args.delay)
+            await asyncio.sleep(args.delay)
 
-def enumerate_subdomains(args):
+    try:
+        await run_bounded(names, probe, args.concurrency, args.cancel)
+    finally:
+        await client.close()
+    return client.stats
+
+class ChannelSink:
+    """ResultSink stand-in for a --processes child: lines and records go to the parent's writer"""
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def append(self, record):
+        with self.lock:
+            self.count += 1
+        self.channel.put(("record", record))
+
+    def append_summary(self, record):
+        self.channel.put(("summary", record))
+
+    def echo(self, line):
+        self.channel.put(("line", line))
+
+    def note(self, line):
+        pass  # Setup and summary lines come from the parent
+
+    def progress(self, line):
+        pass  # The parent draws progress from our telemetry snapshots
+
+    def __len__(self):
+        return self.count
+
+    def drain(self):
+        pass
+
+def scan_stats(stats, throttle, resolver=None):
+    """Plain-data copy of a run's counters, so a --processes child can hand them to the parent"""
+    controller = throttle.controller
+    return {
+        "connections": (stats.opened, stats.reused),
+        "dns": dict(resolver.stats) if resolver else None,
+        "adaptive": (controller.limit, controller.lowest, controller.highest) if controller else None,
+    }
+
+def interrupt_once(signum, frame):
+    """SIGINT handler for children: Ctrl-C reaches them from the terminal and from the parent, stop on the first"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    raise KeyboardInterrupt
+
+def shard_process(entry, args, part, channel, colors):
+    """Body of a --processes child: run entry on one sub-shard with its own output muted"""
+    signal.signal(signal.SIGINT, interrupt_once)
+    # Lines are relayed to the parent's terminal, so they carry its colours (spawned children start without)
+    LazyColors.enabled = colors
+    sys.stdout = open(os.devnull, "w")
+    index, count = part
+    args.shards = args.shards + [part]
+    args.processes = 1
+    if args.rate:
+        args.rate /= count
+    if not args.targets:
+        # Every process hits the same host(s); with --targets-file each gets its own slice of hosts
+        if args.host_rate:
+            args.host_rate /= count
+        if args.host_concurrency:
+            args.host_concurrency = max(1, args.host_concurrency // count)
+    if args.checkpoint:
+        args.checkpoint = checkpoint_part(args.checkpoint, index, count)
+    args.telemetry = Telemetry()
+    finished = threading.Event()
+
+    def publish():
+        while not finished.wait(PROGRESS_INTERVAL):
+            channel.put(("telemetry", (index, args.telemetry.snapshot())))
+
+    threading.Thread(target=publish, daemon=True).start()
+    summary = None
+    try:
+        summary = entry(args, ChannelSink(channel))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        finished.set()
+        channel.put(("telemetry", (index, args.telemetry.snapshot())))
+        channel.put(("done", summary))
+
+def run_processes(entry, args, results, stats, throttle, resolver=None):
+    """Run entry in args.processes sharded child processes, merging their output into results and their counters into ours"""
+    channel = multiprocessing.Queue()
+    workers = [
+        multiprocessing.Process(target=shard_process, args=(entry, args, (index, args.processes), channel, LazyColors.enabled), daemon=True)
+        for index in range(args.processes)
+    ]
+    for worker in workers:
+        worker.start()
+
+    interrupted = []
+
+    def stop_children():
+        for worker in workers:
+            try:
+                os.kill(worker.pid, signal.SIGINT)
+            except (ProcessLookupError, TypeError):
+                pass  # Already exited, or not started yet
+
+    def forward(signum, frame):
+        # Pass Ctrl-C on and keep collecting while the children save their progress
+        interrupted.append(signum)
+        stop_children()
+
+    # Handlers can only be installed from the main thread; a Scanner thread stops us through args.cancel
+    in_main_thread = threading.current_thread() is threading.main_thread()
+    previous = signal.signal(signal.SIGINT, forward) if in_main_thread else None
+    cancelled = False
+
+    # Adaptive figures are totals across processes
+    if throttle.controller:
+        throttle.controller.limit = throttle.controller.lowest = throttle.controller.highest = 0
+    running = len(workers)
+    try:
+        while running:
+            if args.cancel.is_set() and not cancelled:
+                cancelled = True
+                stop_children()
+            try:
+                kind, value = channel.get(timeout=FLUSH_INTERVAL)
+            except Empty:
+                if not any(worker.is_alive() for worker in workers):
+                    break  # A child died without reporting back
+                continue
+            if kind == "record":
+                results.append(value)
+            elif kind == "summary":
+                results.append_summary(value)
+            elif kind == "line":
+                results.echo(value)
+            elif kind == "telemetry":
+                args.telemetry.merge(*value)
+            else:
+                running -= 1
+                if not value:
+                    continue
+                opened, reused = value["connections"]
+                stats.opened += opened
+                stats.reused += reused
+                if resolver and value["dns"]:
+                    for key, count in value["dns"].items():
+                        resolver.stats[key] += count
+                if throttle.controller and value["adaptive"]:
+                    controller = throttle.controller
+                    limit, lowest, highest = value["adaptive"]
+                    controller.limit += limit
+                    controller.lowest += lowest
+                    controller.highest += highest
+    finally:
+        if in_main_thread:
+            signal.signal(signal.SIGINT, previous)
+
+    for worker in workers:
+        worker.join()
+    if interrupted:
+        raise KeyboardInterrupt
+
+def checkpoint_part(path, index, count):
+    """The checkpoint file --processes child `index` of `count` keeps next to the --checkpoint path"""
+    return f"{path}.{index + 1}of{count}"
+
+def checkpoint_splits(path):
+    """Process counts that left progress at a --checkpoint path: 1 for the file itself, n for its .iofn parts"""
+    directory, name = os.path.split(os.path.abspath(path))
+    counts = {1} if os.path.exists(path) else set()
+    for entry in os.listdir(directory):
+        match = re.fullmatch(re.escape(name) + r"\.\d+of(\d+)", entry)
+        if match:
+            counts.add(int(match.group(1)))
+    return counts
+
+def start_checkpoint(args, wordlist_paths, start, end, results):
+    """Open the --checkpoint file for this run and report how much --resume skips
+
+    With --processes each child keeps its own part file; on --resume the parent checks them here,
+    since a different process count splits the payloads differently and would silently start over.
+    """
+    if args.resume:
+        splits = checkpoint_splits(args.checkpoint)
+        if splits - {args.processes}:
+            written = " and ".join(str(count) for count in sorted(splits))
+            raise ScanError(f"cannot resume: '{args.checkpoint}' holds progress from --processes {written}; "
+                            f"resume with the same --processes value")
+    if args.processes > 1 and not args.resume:
+        return Checkpoint(start=start, end=end)
+    parts = [(index, args.processes) for index in range(args.processes)] if args.processes > 1 else [None]
+    finished = remaining = 0
+    for part in parts:
+        part_args, part_start, part_end = args, start, end
+        if part is not None:
+            # The same fingerprint and bounds the child will compute, so a mismatch is reported here
+            low, high = shard_bounds(end - start, [part])
+            part_start, part_end = start + low, start + high
+            part_args = argparse.Namespace(**dict(
+                vars(args), shards=args.shards + [part],
+                checkpoint=checkpoint_part(args.checkpoint, *part),
+            ))
+        try:
+            checkpoint = Checkpoint.from_args(part_args, wordlist_paths, part_start, part_end)
+        except (ValueError, KeyError, OSError) as e:
+            raise ScanError(f"cannot resume: {e}")
+        finished += checkpoint.finished
+        remaining += checkpoint.remaining
+    if args.resume:
+        if finished:
+            results.note(Fore.GREEN + f"[+] Resuming from checkpoint: {finished} done, {remaining} remaining")
+        else:
+            results.note(Fore.YELLOW + f"[!] No progress recorded in '{args.checkpoint}', starting from the beginning")
+    if args.processes > 1:
+        return Checkpoint(start=start, end=end)  # Each child keeps its own checkpoint file
+    return checkpoint
+
+def iter_names(parts, domains, start):
+    """Yield subdomain.domain for every subdomain in `parts` (lists or compiled wordlists) and domain, from index `start`"""
+    row, column = divmod(start, len(domains))
+    for part in parts:
+        if row >= len(part):
+            row -= len(part)
+            continue
+        for subdomain in iter_from(part, row):
+            for domain in itertools.islice(domains, column, None):
+                yield f"{subdomain}.{domain}"
+            column = 0
+        row = 0
+
+def enumerate_subdomains(args, results):
     """Perform subdomain enumeration"""
-    print(Fore.CYAN + f"[+] Starting subdomain enumeration for: {args.domain}")
+    domains = [domain for domain, _ in args.targets] or [args.domain]
+    if args.targets:
+        results.note(Fore.CYAN + f"[+] Starting subdomain enumeration for {len(domains)} domains from {args.targets_file}")
+    else:
+        results.note(Fore.CYAN + f"[+] Starting subdomain enumeration for: {args.domain}")
     
     # Prepare subdomain list
     subdomains = []
+    wordlist_paths = []
     
     if args.subdomain_wordlist:
         try:
-            with open(args.subdomain_wordlist, "r", encoding="utf-8", errors="ignore") as f:
-                subdomains = [line.strip() for line in f if line.strip()]
-            print(Fore.YELLOW + f"[+] Loaded subdomain wordlist: {args.subdomain_wordlist} ({len(subdomains)} subdomains)")
+            if is_compiled(args.subdomain_wordlist):
+                subdomains = CompiledWordlist(args.subdomain_wordlist)
+            else:
+                with open(args.subdomain_wordlist, "r", encoding="utf-8", errors="ignore") as f:
+                    subdomains = [line.strip() for line in f if line.strip()]
+            wordlist_paths.append(args.subdomain_wordlist)
+            results.note(Fore.YELLOW + f"[+] Loaded subdomain wordlist: {args.subdomain_wordlist} ({len(subdomains)} subdomains)")
         except FileNotFoundError:
-            print(Fore.RED + f"[-] Error: Subdomain wordlist '{args.subdomain_wordlist}' not found, using default list")
+            results.note(Fore.RED + f"[-] Error: Subdomain wordlist '{args.subdomain_wordlist}' not found, using default list")
             subdomains = DEFAULT_SUBDOMAINS.copy()
+        except ValueError as e:
+            raise ScanError(str(e))
     else:
         subdomains = DEFAULT_SUBDOMAINS.copy()
-        print(Fore.GREEN + f"[+] Using default subdomain list ({len(subdomains)} subdomains)")
+        results.note(Fore.GREEN + f"[+] Using default subdomain list ({len(subdomains)} subdomains)")
     
     # Add user-provided subdomains
-    if args.extra_subdomains:
-        extra_subs = args.extra_subdomains.split(',')
-        subdomains.extend(extra_subs)
-        print(Fore.GREEN + f"[+] Added {len(extra_subs)} extra subdomains")
-    
-    # Remove duplicates
-    subdomains = list(set(subdomains))
-    print(Fore.CYAN + f"[+] Total unique subdomains to test: {len(subdomains)}")
+    extra_subs = [sub for sub in args.extra_subdomains.split(',') if sub] if args.extra_subdomains else []
+    if extra_subs:
+        results.note(Fore.GREEN + f"[+] Added {len(extra_subs)} extra subdomains")
     
-    # Create queue and results
-    queue = Queue()
-    results = []
-    
-    for subdomain in subdomains:
-        queue.put(subdomain)
-    
-    # Start threads
-    threads = []
-    for _ in range(args.threads):
-        t = threading.Thread(target=subdomain_worker, args=(queue, args, results, args.domain))
-        t.daemon = True
-        t.start()
-        threads.append(t)
+    # Remove duplicates, keeping wordlist order so checkpoint indices mean the same thing next run.
+    # A compiled wordlist is already unique and stays mapped; extras it holds are dropped instead.
+    if isinstance(subdomains, CompiledWordlist):
+        parts = [subdomains, [sub for sub in dict.fromkeys(extra_subs) if sub not in subdomains]]
+    else:
+        parts = [list(dict.fromkeys(sub for sub in subdomains + extra_subs if sub))]
+    unique = sum(len(part) for part in parts)
+    results.note(Fore.CYAN + f"[+] Total unique subdomains to test: {unique}")
+    # Subdomain-major order interleaves the domains, so no single one takes every probe in a row
+    total = unique * len(domains)
+    start, end = shard_bounds(total, args.shards)
+    if args.shards:
+        results.note(Fore.CYAN + f"[+] Shard: names {start}-{end} of {total}")
+    checkpoint = start_checkpoint(args, wordlist_paths, start, end, results)
+    names = checkpoint.pending(iter_names(parts, domains, checkpoint.completed))
     
-    # Wait for completion
-    queue.join()
+    resolver = None if args.skip_dns else SubdomainResolver(args)
+    if resolver and resolver.nameservers:
+        results.note(Fore.CYAN + f"[+] Resolvers: {', '.join(resolver.nameservers)}")
+
+    throttle = Throttle(args, args.concurrency if args.engine == "async" else args.threads, results)
+    args.telemetry.start(results, checkpoint)
+    try:
+        if args.processes > 1:
+            results.note(Fore.CYAN + f"[+] Processes: {args.processes}")
+            stats = ConnectionStats()
+            run_processes(enumerate_subdomains, args, results, stats, throttle, resolver)
+        else:
+            try:
+                if args.engine == "async":
+                    raise_fd_limit()
+                    stats = asyncio.run(async_enumerate(args, names, results, throttle, checkpoint, resolver))
+                else:
+                    if resolver is None:
+                        hosts = ((index, name, None) for index, name in names)
+                    else:
+                        hosts = resolve_subdomains(args, resolver, names, results, checkpoint)
+                    pool = ConnectionPool(args)
+                    with ThreadPoolExecutor(max_workers=args.threads * 2) as executor:
+                        run_thread_pool(subdomain_worker, hosts, args, results, pool, throttle, Reachability(), executor, checkpoint)
+                    pool.close()
+                    stats = pool.stats
+            finally:
+                checkpoint.save()
+    finally:
+        args.telemetry.stop(results)
+        if args.response_index:
+            args.response_index.report(results)
     
-    print(Fore.GREEN + f"\n[+] Subdomain enumeration completed! Found {len(results)} valid subdomains")
-    return results
+    results.drain()
+    results.note(Fore.GREEN + f"\n[+] Subdomain enumeration completed! Found {len(results)} valid subdomains")
+    if resolver:
+        results.note(Fore.CYAN + f"[+] DNS: {resolver.summary()}")
+    timing = args.telemetry.summary()
+    if timing:
+        results.note(Fore.CYAN + f"[+] Timing: {timing}")
+    if args.response_index and args.processes == 1:
+        results.note(Fore.CYAN + f"[+] Fingerprints: {args.response_index.summary()}")
+    if throttle.controller:
+        results.note(Fore.CYAN + f"[+] Adaptive: {throttle.summary()}")
+    results.note(Fore.CYAN + f"[+] Connections: {stats.summary()}")
+    return scan_stats(stats, throttle, resolver)
+
+def fuzz_endpoints(args, results):
+    """Perform endpoint fuzzing"""
+    if not args.wordlist and sys.stdin.isatty():
+        raise ScanError("Either provide a wordlist file with -w or pipe input through stdin")
+
+    if not args.wordlist and (args.checkpoint or args.shards or args.processes > 1 or args.targets):
+        raise ScanError("--checkpoint, --shard, --processes and --targets-file need a wordlist file (-w); stdin has no fixed index space")
+
+    if args.targets and args.checkpoint:
+        raise ScanError("--targets-file cannot be combined with --checkpoint; use --shard to split the target list instead")
+
+    # --targets-file shards and --processes split the target list; a single target splits the payloads
+    targets = args.targets or [(args.target, 1)]
+    if args.targets:
+        start, end = shard_bounds(len(targets), args.shards)
+        targets = targets[start:end]
+    headers = parse_headers(args.headers)
+    templates = [RequestTemplate(target, headers, args.data, not args.no_encode) for target, _ in targets]
+    args.request_template = templates[0]
+    wordlist_count = len(args.wordlist.split(',')) if args.wordlist else 1
+    for template in templates:
+        used = template.wordlists_used
+        if max(used) >= wordlist_count:
+            raise ScanError(f"FUZ{max(used) + 1}Z used but only {wordlist_count} wordlist(s) given")
+        if len(used) != wordlist_count:
+            unused = ", ".join(str(i + 1) for i in range(wordlist_count) if i not in used)
+            raise ScanError(f"Wordlist(s) {unused} not used; place FUZ2Z, FUZ3Z, ... (or wordlist_N in --data) in the URL, headers or data")
+    if args.recursion_depth:
+        if wordlist_count != 1 or not args.wordlist or not all(template.path_slot for template in templates):
+            raise ScanError("--recursion-depth needs one wordlist file (-w) and a single FUZZ in the URL path")
+        if args.checkpoint:
+            raise ScanError("--recursion-depth cannot be combined with --checkpoint; discovered directories are not recorded")
+
+    total = None
+    checkpoint = Checkpoint()
+    words = None
+
+    if args.targets:
+        # Loaded once; every target then walks its own lazy pass over the payloads
+        wordlists = load_wordlists(args.wordlist, results)
+        per_target = count_combinations(wordlists, args.mode)
+        if len(wordlists) == 1:
+            words = wordlists[0]
+        else:
+            results.note(Fore.GREEN + f"[+] Keyspace: {per_target} combinations per target")
+        total = per_target * len(targets)
+        checkpoint = Checkpoint(start=0, end=total)
+    elif args.wordlist:
+        if ',' in args.wordlist:
+            results.note(Fore.YELLOW + f"[+] Multiple wordlists detected, streaming {args.mode} combinations...")
+            wordlists = load_wordlists(args.wordlist, results)
+
+            total = count_combinations(wordlists, args.mode)
+            results.note(Fore.GREEN + f"[+] Keyspace: {total} combinations")
+            checkpoint = start_checkpoint(args, [path.strip() for path in args.wordlist.split(',')], *shard_bounds(total, args.shards), results)
+            payloads = iter_combinations(wordlists, args.mode, checkpoint.completed)
+        else:
+            try:
+                total = count_lines(args.wordlist)
+            except FileNotFoundError:
+                raise ScanError(f"Wordlist file '{args.wordlist}' not found")
+            except Exception as e:
+                raise ScanError(f"cannot read wordlist: {e}")
+            checkpoint = start_checkpoint(args, [args.wordlist], *shard_bounds(total, args.shards), results)
+            payloads = iter_wordlist(args.wordlist, checkpoint.completed)
+            results.note(Fore.GREEN + f"[+] Loaded wordlist: {args.wordlist}")
+    else:
+        results.note(Fore.YELLOW + "[+] Reading wordlist from stdin...")
+        payloads = iter_lines(sys.stdin)
+
+    if args.targets:
+        results.note(Fore.CYAN + f"[+] Targets: {len(targets)} from {args.targets_file}")
+    else:
+        results.note(Fore.CYAN + f"[+] Target URL: {args.target}")
+    results.note(Fore.CYAN + f"[+] HTTP Method: {args.method}")
+    if args.data:
+        results.note(Fore.CYAN + f"[+] Request Data: {args.data}")
+    if args.engine == "async":
+        results.note(Fore.CYAN + f"[+] Engine: async ({args.concurrency} in flight)")
+    else:
+        results.note(Fore.CYAN + f"[+] Threads: {args.threads}")
+    results.note(Fore.CYAN + f"[+] Total payloads: {total if total is not None else 'streaming from stdin'}")
+    if args.shards and args.targets:
+        results.note(Fore.CYAN + f"[+] Shard: targets {start}-{end} of {len(args.targets)}")
+    elif args.shards:
+        results.note(Fore.CYAN + f"[+] Shard: payloads {checkpoint.start}-{checkpoint.end} of {total}")
+    if args.host_concurrency or args.host_rate:
+        limits = [f"{args.host_concurrency} in flight" if args.host_concurrency else "", f"{args.host_rate:g} req/s" if args.host_rate else ""]
+        results.note(Fore.CYAN + f"[+] Per-host limit: {', '.join(limit for limit in limits if limit)}")
+    if args.processes > 1:
+        results.note(Fore.CYAN + f"[+] Processes: {args.processes}")
+    if args.rate:
+        results.note(Fore.CYAN + f"[+] Rate limit: {args.rate:g} req/s")
+    if args.adaptive:
+        results.note(Fore.CYAN + "[+] Adaptive concurrency: Enabled")
+    results.note(Fore.CYAN + f"[+] Verbose mode: {'Enabled' if args.verbose else 'Disabled'}")
+
+    # Display filter information
+    if args.filter_status:
+        results.note(Fore.CYAN + f"[+] Status filter: {args.filter_status}")
+    if args.filter_size:
+        results.note(Fore.CYAN + f"[+] Size filter: {args.filter_size}")
+    if args.filter_content:
+        results.note(Fore.CYAN + f"[+] Content filter: {args.filter_content}")
+    if args.exclude_content:
+        results.note(Fore.CYAN + f"[+] Exclude content: {args.exclude_content}")
+    if args.collapse:
+        results.note(Fore.CYAN + "[+] Collapsing near-duplicate responses: Enabled")
+    if args.recursion_depth:
+        results.note(Fore.CYAN + f"[+] Recursion depth: {args.recursion_depth}")
+
+    # Calibrate once; --processes children inherit the baselines with args
+    if args.auto_calibrate and not args.response_index.calibrated:
+        calibrate(args, templates, results)
+
+    results.note(Fore.CYAN + "[+] Starting endpoint fuzzing...\n")
+
+    throttle = Throttle(args, args.concurrency if args.engine == "async" else args.threads, results)
+    frontier = scheduler = None
+    args.telemetry.start(results, checkpoint)
+    try:
+        if args.processes > 1:
+            stats = ConnectionStats()
+            run_processes(fuzz_endpoints, args, results, stats, throttle)
+        else:
+            if args.targets or args.recursion_depth or args.host_concurrency or args.host_rate:
+                if args.recursion_depth:
+                    passes = (lambda: iter(words)) if words is not None else (lambda: iter_wordlist(args.wordlist))
+                    frontier = Frontier(args.recursion_depth, templates, passes)
+                scheduler = HostScheduler(args.host_concurrency, args.host_rate, frontier)
+                if args.targets:
+                    # Index payload w of target t as w * len(targets) + t, the order a plain round-robin visits them
+                    for position, (template, (target, weight)) in enumerate(zip(templates, targets)):
+                        items = iter(words) if words is not None else iter_combinations(wordlists, args.mode)
+                        entries = ((w * len(targets) + position, item) for w, item in enumerate(items))
+                        scheduler.add(ScanJob(template, 0, target), entries, (0,), weight)
+                else:
+                    scheduler.add(ScanJob(templates[0]), checkpoint.pending(payloads))
+            else:
+                entries = ((index, item, None) for index, item in checkpoint.pending(payloads))
+            try:
+                if args.engine == "async":
+                    raise_fd_limit()
+                    if scheduler:
+                        entries = scheduler.payloads_async()
+                    stats = asyncio.run(async_fuzz(args, entries, results, throttle, checkpoint, scheduler=scheduler))
+                else:
+                    if scheduler:
+                        entries = scheduler.payloads()
+                    pool = ConnectionPool(args)
+                    run_thread_pool(fuzz_worker, entries, args, results, pool, throttle, checkpoint, scheduler)
+                    pool.close()
+                    stats = pool.stats
+            finally:
+                checkpoint.save()
+    finally:
+        args.telemetry.stop(results)
+        if args.response_index:
+            args.response_index.report(results)
+
+    results.drain()
+    results.note(Fore.GREEN + f"\n[+] Endpoint fuzzing completed! Found {len(results)} interesting results")
+    timing = args.telemetry.summary()
+    if timing:
+        results.note(Fore.CYAN + f"[+] Timing: {timing}")
+    if args.response_index and args.processes == 1:
+        results.note(Fore.CYAN + f"[+] Fingerprints: {args.response_index.summary()}")
+    if frontier:
+        results.note(Fore.CYAN + f"[+] Recursion: {frontier.summary()}")
+    results.note(Fore.CYAN + f"[+] Connections: {stats.summary()}")
+    if throttle.controller:
+        results.note(Fore.CYAN + f"[+] Adaptive: {throttle.summary()}")
+    return scan_stats(stats, throttle)
+
+def prepare_args(args):
+    """Validate parsed options and attach the shared scan state (filters, telemetry, targets); raises ScanError"""
+    try:
+        args.response_filter = ResponseFilter.from_args(args)
+    except ValueError as e:
+        raise ScanError(str(e))
+
+    args.telemetry = Telemetry.from_args(args)
+    args.response_index = ResponseIndex.from_args(args)
+
+    args.targets = []
+    if args.targets_file:
+        try:
+            args.targets = load_targets(args.targets_file)
+        except (OSError, ValueError) as e:
+            raise ScanError(f"cannot read targets: {e}")
+        if "://" in args.targets[0][0]:
+            args.target = args.targets[0][0]
+        else:
+            args.domain = args.targets[0][0]
+    args.target_domains = frozenset(domain for domain, _ in args.targets) if args.domain else frozenset()
+
+    if args.host_concurrency < 0:
+        raise ScanError("--host-concurrency cannot be negative")
+
+    if args.domain and (args.host_concurrency or args.host_rate):
+        raise ScanError("--host-concurrency and --host-rate apply to endpoint fuzzing (-u or a --targets-file of URLs)")
+
+    if args.recursion_depth < 0:
+        raise ScanError("--recursion-depth cannot be negative")
+
+    if args.auto_calibrate and not args.target:
+        raise ScanError("--auto-calibrate applies to endpoint fuzzing (-u); use --collapse for subdomain scans")
+
+    if args.status_probe and args.response_filter.needs_body:
+        raise ScanError("--status-probe skips response bodies and cannot be combined with content filters")
+
+    args.shards = [args.shard] if args.shard else []
+    if args.processes < 1:
+        raise ScanError("--processes must be at least 1")
+
+    if args.resume and not args.checkpoint:
+        raise ScanError("--resume needs the --checkpoint file of the interrupted run")
+
+    args.cancel = Cancellation()
+    return args
+
+# Allowed values of the options with a fixed set of choices, shared by the CLI and ScanConfig
+OPTION_CHOICES = {
+    "method": ["GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS"],
+    "mode": ["clusterbomb", "pitchfork"],
+    "scheme_policy": ["prefer-https", "first", "sequential"],
+    "engine": ["thread", "async"],
+    "output_format": ["json", "jsonl", "csv"],
+    "stats_format": ["json", "prometheus"],
+    "status_probe": ["head", "range"],
+}
+
+@dataclass
+class ScanConfig:
+    """Options for a Scanner, named after the command-line flags (-u is target, --host-rate is host_rate)
+
+    Exactly one of target, domain or targets_file picks the scan mode. Rates, sizes and shards
+    take the same strings as the command line ("50/s", "64k", "3/8"); wordlist and
+    extra_subdomains also take a list. Terminal-only flags (banner, progress line, colours) have no
+    equivalent because a Scanner never prints.
+    """
+
+    # Mode
+    target: Optional[str] = None
+    domain: Optional[str] = None
+    targets_file: Optional[str] = None
+    # Endpoint fuzzing
+    wordlist: Union[str, Sequence[str], None] = None
+    headers: Optional[str] = None
+    method: str = "GET"
+    mode: str = "clusterbomb"
+    data: Optional[str] = None
+    recursion_depth: int = 0
+    no_encode: bool = False
+    # Subdomain enumeration
+    subdomain_wordlist: Optional[str] = None
+    extra_subdomains: Union[str, Sequence[str], None] = None
+    skip_dns: bool = False
+    resolvers: Optional[str] = None
+    dns_concurrency: int = 100
+    dedup_ip: bool = False
+    probe_unresolved: bool = False
+    scheme_policy: str = "prefer-https"
+    no_https: bool = False
+    force_https: bool = False
+    # Common
+    threads: int = 10
+    engine: str = "thread"
+    concurrency: int = 500
+    connect_timeout: float = 5
+    read_timeout: float = 5
+    rate: Union[float, str, None] = None
+    adaptive: bool = False
+    delay: float = 0
+    output: Optional[str] = None
+    output_format: Optional[str] = None
+    shard: Optional[str] = None
+    processes: int = 1
+    checkpoint: Optional[str] = None
+    resume: bool = False
+    pool_size: int = 0
+    host_concurrency: int = 0
+    host_rate: Union[float, str, None] = None
+    max_host_connections: int = 0
+    retries: int = 0
+    stats_file: Optional[str] = None
+    stats_format: Optional[str] = None
+    verbose: bool = False
+    # Filtering
+    filter_status: Optional[str] = None
+    filter_size: Optional[str] = None
+    filter_content: Optional[str] = None
+    exclude_content: Optional[str] = None
+    max_body: Union[int, str] = 0
+    status_probe: Optional[str] = None
+    auto_calibrate: bool = False
+    collapse: bool = False
+
+    def to_args(self):
+        """The argparse-style namespace the scan functions read, checked like the command line; raises ScanError"""
+        args = argparse.Namespace(**asdict(self))
+        if sum(bool(mode) for mode in (args.target, args.domain, args.targets_file)) != 1:
+            raise ScanError("set exactly one of target, domain or targets_file")
+        for name, choices in OPTION_CHOICES.items():
+            value = getattr(args, name)
+            if value is not None and value not in choices:
+                raise ScanError(f"{name} must be one of {', '.join(choices)}, not {value!r}")
+        for name in ("wordlist", "extra_subdomains"):
+            value = getattr(args, name)
+            if value is not None and not isinstance(value, str):
+                setattr(args, name, ",".join(value))
+        try:
+            for name, parse in (("rate", parse_rate), ("host_rate", parse_rate), ("max_body", parse_size), ("shard", parse_shard)):
+                if isinstance(getattr(args, name), str):
+                    setattr(args, name, parse(getattr(args, name)))
+        except argparse.ArgumentTypeError as e:
+            raise ScanError(str(e))
+        args.no_progress = True
+        args.quiet_errors = True
+        prepare_args(args)
+        if args.target and not args.wordlist:
+            raise ScanError("endpoint fuzzing needs a wordlist; a Scanner does not read stdin")
+        return args
+
+# Marks the end of a Scanner's record stream
+END_OF_RESULTS = object()
+
+class Scanner:
+    """Run a scan in the background and hand back its result records as they are found
+
+        scanner = Scanner(ScanConfig(target="https://example.com/FUZZ", wordlist="common.txt", engine="async"))
+        for record in scanner:          # or: async for record in scanner
+            print(record["status"], record["url"])
+        print(scanner.stats())
+
+    Records are the dicts written to -o files, which are still written if output is set.
+    cancel(), or leaving the loop early, stops handing out payloads; requests already in flight
+    finish and --checkpoint progress is saved. A Scanner runs once.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.args = config.to_args()
+        self.results = None
+        self.thread = None
+        self.summary = None
+        self.error = None
+        self.finished = threading.Event()
+
+    def _start(self, deliver):
+        if self.thread is not None:
+            raise RuntimeError("this Scanner has already run; create a new one")
+        args = self.args
+        fields = FUZZ_FIELDS if args.target else SUBDOMAIN_FIELDS
+        self.results = ResultSink(args.output, output_format(args), fields, append=args.resume, terminal=False, on_record=deliver)
+        self.thread = threading.Thread(target=self._run, args=(deliver,), daemon=True)
+        self.thread.start()
+
+    def _run(self, deliver):
+        try:
+            scan = fuzz_endpoints if self.args.target else enumerate_subdomains
+            self.summary = scan(self.args, self.results)
+        except Exception as e:
+            self.error = e
+        finally:
+            self.results.close()
+            self.finished.set()
+            deliver(END_OF_RESULTS)
+
+    def __iter__(self):
+        records = Queue()
+        self._start(records.put)
+        try:
+            while True:
+                record = records.get()
+                if record is END_OF_RESULTS:
+                    break
+                yield record
+            if self.error:
+                raise self.error
+        finally:
+            if not self.finished.is_set():
+                self.cancel()
+            self.thread.join()
+
+    async def __aiter__(self):
+        loop = asyncio.get_running_loop()
+        records = asyncio.Queue()
+
+        def deliver(record):
+            try:
+                loop.call_soon_threadsafe(records.put_nowait, record)
+            except RuntimeError:
+                pass  # The consumer's event loop is gone
+
+        self._start(deliver)
+        try:
+            while True:
+                record = await records.get()
+                if record is END_OF_RESULTS:
+                    break
+                yield record
+            if self.error:
+                raise self.error
+        finally:
+            if not self.finished.is_set():
+                self.cancel()
+            await loop.run_in_executor(None, self.thread.join)
+
+    def cancel(self):
+        """Stop the scan early; the record stream ends once in-flight requests are done"""
+        self.args.cancel.set()
+
+    def stats(self):
+        """Counters so far, shaped like the JSON --stats-file (requests_per_second is the run average)"""
+        telemetry = self.args.telemetry
+        state = telemetry.snapshot()
+        elapsed = time.monotonic() - telemetry.started
+        report = telemetry.report(state, telemetry.requests(state) / elapsed if elapsed > 0 else 0.0)
+        report["results"] = len(self.results) if self.results else 0
+        report["running"] = self.thread is not None and not self.finished.is_set()
+        report["cancelled"] = self.args.cancel.is_set()
+        if self.summary:
+            opened, reused = self.summary["connections"]
+            report["connections"] = {"opened": opened, "reused": reused}
+            if self.summary["dns"]:
+                report["dns"] = self.summary["dns"]
+        return report
 
 def main():
+    enable_colors()
     display_banner()
+    if sys.argv[1:2] == ["compile"]:
+        return compile_main(sys.argv[2:])
     
     parser = argparse.ArgumentParser(description="API FUZZER & Subdomain Enumerator - Discover Hidden Endpoints and Subdomains")
     
     # Mode selection
     mode_group = parser.add_mutually_exclusive_group(required=True)
-    mode_group.add_argument("-u", "--url", help="Target URL for endpoint fuzzing (use FUZZ placeholder)", dest="target")
+    mode_group.add_argument("-u", "--url", help="Target URL for endpoint fuzzing (use FUZZ placeholder; FUZ2Z, FUZ3Z, ... for further wordlists)", dest="target")
     mode_group.add_argument("-d", "--domain", help="Target domain for subdomain enumeration")
+    mode_group.add_argument("--targets-file", help="Scan many targets in one run: one URL (endpoint fuzzing) or domain (subdomain enumeration) per line, URLs may be followed by a scheduling weight; --host-concurrency and --host-rate apply to URLs only")
     
     # Endpoint fuzzing arguments
     fuzzing_group = parser.add_argument_group("Endpoint Fuzzing Options")
     fuzzing_group.add_argument("-w", "--wordlist", help="Wordlist File(s). For multiple wordlists, use comma-separated: user.txt,pass.txt", required=False)
     fuzzing_group.add_argument("-H", "--headers", help="Custom headers (e.g: 'Authorization: Bearer TOKEN, User-Agent: Test')", required=False)
-    fuzzing_group.add_argument("-X", "--method", help="HTTP method", default="GET", choices=["GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS"])
-    fuzzing_group.add_argument("--data", help="POST/PUT data with placeholders: {username: wordlist_1, password: wordlist_2}", required=False)
+    fuzzing_group.add_argument("-X", "--method", help="HTTP method", default="GET", choices=OPTION_CHOICES["method"])
+    fuzzing_group.add_argument("--mode", help="Multi-wordlist mode: clusterbomb (every combination) or pitchfork (line N of each list together)", choices=OPTION_CHOICES["mode"], default="clusterbomb")
+    fuzzing_group.add_argument("--data", help="POST/PUT data with placeholders: {username: FUZZ, password: FUZ2Z} (wordlist_1, wordlist_2 also accepted)", required=False)
+    fuzzing_group.add_argument("--recursion-depth", help="Also fuzz inside directories found (redirects to a trailing '/'), up to this many levels below the target (default=0)", type=int, default=0)
+    fuzzing_group.add_argument("--no-encode", help="Send payloads verbatim instead of encoding them for the URL, JSON or form body they land in", action="store_true")
     
     # Subdomain enumeration arguments
     subdomain_group = parser.add_argument_group("Subdomain Enumeration Options")
     subdomain_group.add_argument("--subdomain-wordlist", help="Custom subdomain wordlist file", required=False)
     subdomain_group.add_argument("--extra-subdomains", help="Extra subdomains to test (comma-separated)", required=False)
     subdomain_group.add_argument("--skip-dns", help="Skip DNS resolution, only HTTP checks", action="store_true")
+    subdomain_group.add_argument("--resolvers", help="DNS servers to round-robin, comma-separated (default: system resolvers)", required=False)
+    subdomain_group.add_argument("--dns-concurrency", help="DNS queries in flight (default=100)", type=int, default=100)
+    subdomain_group.add_argument("--dedup-ip", help="Probe only the first subdomain seen for each set of IPs", action="store_true")
+    subdomain_group.add_argument("--probe-unresolved", help="Also send HTTP probes to names that did not resolve", action="store_true")
+    subdomain_group.add_argument("--scheme-policy", help="How to probe HTTPS and HTTP: prefer-https (both at once, report HTTPS first), first (whichever answers first) or sequential (default=prefer-https)", choices=OPTION_CHOICES["scheme_policy"], default="prefer-https")
     subdomain_group.add_argument("--no-https", help="Don't try HTTPS protocol", action="store_true")
     subdomain_group.add_argument("--force-https", help="Only try HTTPS protocol", action="store_true")
     
     # Common arguments
     common_group = parser.add_argument_group("Common Options")
     common_group.add_argument("-t", "--threads", help="Number of threads (default=10)", type=int, default=10)
-    common_group.add_argument("--delay", help="Delay between requests (seconds)", type=float, default=0)
-    common_group.add_argument("-o", "--output", help="Save results to JSON file", required=False)
+    common_group.add_argument("--engine", help="Scan engine: OS threads or a single asyncio event loop (default=thread)", choices=OPTION_CHOICES["engine"], default="thread")
+    common_group.add_argument("--concurrency", help="Requests in flight for --engine async (default=500)", type=int, default=500)
+    common_group.add_argument("--connect-timeout", help="Seconds to wait for a connection (default=5)", type=float, default=5)
+    common_group.add_argument("--read-timeout", help="Seconds to wait for response data (default=5)", type=float, default=5)
+    common_group.add_argument("--rate", help="Global request rate shared by all workers, e.g. 50 or 50/s or 600/m", type=parse_rate, required=False)
+    common_group.add_argument("--adaptive", help="Tune concurrency automatically: grow while latency is stable, back off on 429/503, Retry-After, timeouts or rising latency", action="store_true")
+    common_group.add_argument("--delay", help="Per-worker delay after each request (seconds); prefer --rate for a global limit", type=float, default=0)
+    common_group.add_argument("-o", "--output", help="Save results to a file: pretty JSON, or JSONL/CSV by extension (.jsonl, .csv) or --output-format", required=False)
+    common_group.add_argument("--output-format", help="Result file format; jsonl and csv are streamed as results arrive", choices=OPTION_CHOICES["output_format"], required=False)
+    common_group.add_argument("--shard", help="Scan only slice i of n of the payload index space, e.g. 3/8; the same wordlists and options always give the same slices", type=parse_shard, required=False)
+    common_group.add_argument("--processes", help="Split the scan across this many worker processes; -t and --concurrency apply per process, --rate is shared (default=1)", type=int, default=1)
+    common_group.add_argument("--checkpoint", help="Record scan progress in this file every few seconds", required=False)
+    common_group.add_argument("--resume", help="Skip the payloads already done in --checkpoint and append to the existing -o file", action="store_true")
+    common_group.add_argument("--pool-size", help="Keep-alive connections kept per host (default=threads)", type=int, default=0)
+    common_group.add_argument("--host-concurrency", help="Requests in flight per host; workers move on to other hosts instead of waiting (default=unlimited)", type=int, default=0)
+    common_group.add_argument("--host-rate", help="Request rate per host, e.g. 20/s; --rate still caps the total", type=parse_rate, required=False)
+    common_group.add_argument("--max-host-connections", help="Hard cap on concurrent connections per host (workers wait for a free one)", type=int, default=0)
+    common_group.add_argument("--retries", help="Retries per request on connection errors (default=0)", type=int, default=0)
+    common_group.add_argument("--stats-file", help="Rewrite live metrics (phase latency histograms, status/error counters, req/s) to this file every few seconds", required=False)
+    common_group.add_argument("--stats-format", help="Metrics format: json or Prometheus text (default: prometheus for .prom files, else json)", choices=OPTION_CHOICES["stats_format"], required=False)
+    common_group.add_argument("--no-progress", help="Don't draw the progress line", action="store_true")
     common_group.add_argument("-v", "--verbose", help="Show all requests including 404s with payload information", action="store_true")
     
     # Filtering arguments
@@ -382,94 +3873,40 @@ def main():
     filter_group.add_argument("--filter-size", help="Filter by response size. Examples: 100-500, >1000, <100, 2048", required=False)
     filter_group.add_argument("--filter-content", help="Filter by content pattern (regex). Examples: 'success|logged', 'error'", required=False)
     filter_group.add_argument("--exclude-content", help="Exclude by content pattern (regex). Examples: 'not found', 'error'", required=False)
+    filter_group.add_argument("--max-body", help="Read at most this much of each body (e.g. 64k, 2m); content filters only see this prefix (default=unlimited)", type=parse_size, default=0)
+    filter_group.add_argument("--status-probe", help="For GET scans without content filters, send HEAD or a one-byte Range request instead", choices=OPTION_CHOICES["status_probe"])
+    filter_group.add_argument("--auto-calibrate", help="Before the scan, learn the responses to a few random payloads (soft-404s, catch-alls) and hide every response resembling them", action="store_true")
+    filter_group.add_argument("--collapse", help="Report the first of each group of identical or near-identical responses and count the rest", action="store_true")
     filter_group.add_argument("--quiet-errors", help="Don't display error messages", action="store_true")
     
     args = parser.parse_args()
 
-    results = []
-
-    # Endpoint fuzzing mode
-    if args.target:
-        if not args.wordlist and sys.stdin.isatty():
-            print(Fore.RED + "[-] Error: Either provide a wordlist file with -w or pipe input through stdin")
-            sys.exit(1)
-
-        queue = Queue()
-        
-        if args.wordlist:
-            if ',' in args.wordlist:
-                print(Fore.YELLOW + "[+] Multiple wordlists detected, generating combinations...")
-                combinations = load_wordlists(args.wordlist)
-                
-                if args.data:
-                    expected_placeholders = len(args.wordlist.split(','))
-                    actual_placeholders = sum(1 for i in range(1, expected_placeholders + 1) if f"wordlist_{i}" in args.data)
-                    if actual_placeholders != expected_placeholders:
-                        print(Fore.RED + f"[-] Error: Data expects {expected_placeholders} placeholders (wordlist_1, wordlist_2, etc.) but found {actual_placeholders}")
-                        sys.exit(1)
-                
-                for combo in combinations:
-                    queue.put(combo)
-                print(Fore.GREEN + f"[+] Generated {len(combinations)} combinations")
-            else:
-                try:
-                    with open(args.wordlist, "r", encoding="utf-8", errors="ignore") as f:
-                        for line in f:
-                            queue.put(line.strip())
-                    print(Fore.GREEN + f"[+] Loaded wordlist: {args.wordlist}")
-                except FileNotFoundError:
-                    print(Fore.RED + f"[-] Error: Wordlist file '{args.wordlist}' not found")
-                    sys.exit(1)
-                except Exception as e:
-                    print(Fore.RED + f"[-] Error reading wordlist: {e}")
-                    sys.exit(1)
-        else:
-            print(Fore.YELLOW + "[+] Reading wordlist from stdin...")
-            for line in sys.stdin:
-                queue.put(line.strip())
-
-        print(Fore.CYAN + f"[+] Target URL: {args.target}")
-        print(Fore.CYAN + f"[+] HTTP Method: {args.method}")
-        if args.data:
-            print(Fore.CYAN + f"[+] Request Data: {args.data}")
-        print(Fore.CYAN + f"[+] Threads: {args.threads}")
-        print(Fore.CYAN + f"[+] Total payloads: {queue.qsize()}")
-        print(Fore.CYAN + f"[+] Verbose mode: {'Enabled' if args.verbose else 'Disabled'}")
-        
-        # Display filter information
-        if args.filter_status:
-            print(Fore.CYAN + f"[+] Status filter: {args.filter_status}")
-        if args.filter_size:
-            print(Fore.CYAN + f"[+] Size filter: {args.filter_size}")
-        if args.filter_content:
-            print(Fore.CYAN + f"[+] Content filter: {args.filter_content}")
-        if args.exclude_content:
-            print(Fore.CYAN + f"[+] Exclude content: {args.exclude_content}")
-        
-        print(Fore.CYAN + "[+] Starting endpoint fuzzing...\n")
-
-        # Start the threads for endpoint fuzzing
-        threads = []
-        for _ in range(args.threads):
-            t = threading.Thread(target=fuzz_worker, args=(queue, args, results))
-            t.daemon = True
-            t.start()
-            threads.append(t)
-
-        # Wait for all threads to complete
-        queue.join()
-        
-        print(Fore.GREEN + f"\n[+] Endpoint fuzzing completed! Found {len(results)} interesting results")
+    try:
+        prepare_args(args)
+    except ScanError as e:
+        print(Fore.RED + f"[-] Error: {e}")
+        sys.exit(1)
 
-    # Subdomain enumeration mode
-    elif args.domain:
-        results = enumerate_subdomains(args)
+    fields = FUZZ_FIELDS if args.target else SUBDOMAIN_FIELDS
+    results = ResultSink(args.output, output_format(args), fields, append=args.resume)
+    saved = failed = None
+    try:
+        if args.target:
+            fuzz_endpoints(args, results)
+        elif args.domain:
+            enumerate_subdomains(args, results)
+    except ScanError as e:
+        failed = e
+    except KeyboardInterrupt:
+        print(Fore.YELLOW + "\n[!] Interrupted, saving partial results...")
+    finally:
+        saved = results.close()
 
-    # Save results
-    if args.output and results:
-        with open(args.output, "w") as f:
-            json.dump(results, f, indent=2)
-        print(Fore.CYAN + f"[+] Results saved to: {args.output}")
+    if failed:
+        print(Fore.RED + f"[-] Error: {failed}")
+        sys.exit(1)
+    if saved:
+        print(Fore.CYAN + f"[+] Results saved to: {saved}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,93 @@
+import itertools
+
+import pytest
+
+from fuzzhound import Checkpoint, CompiledWordlist, checkpoint_part, checkpoint_splits, compile_wordlist, iter_combinations
+
+
+def test_save_and_load_keep_out_of_order_indices(tmp_path):
+    path = str(tmp_path / "scan.ckpt")
+    checkpoint = Checkpoint(path, "abc", start=0, end=10)
+    for index in (0, 1, 4, 6, 9):
+        checkpoint.done(index)
+    checkpoint.save()
+
+    resumed = Checkpoint(path, "abc", start=0, end=10)
+    resumed.load()
+    assert resumed.completed == 2
+    assert resumed.ahead == {4, 6, 9}
+    assert resumed.finished == 5
+    assert resumed.remaining == 5
+    assert [index for index, _ in resumed.pending(iter(range(2, 10)))] == [2, 3, 5, 7, 8]
+
+
+def test_done_advances_past_indices_finished_ahead(tmp_path):
+    checkpoint = Checkpoint(str(tmp_path / "scan.ckpt"), "abc", start=5, end=10)
+    checkpoint.done(7)
+    checkpoint.done(6)
+    assert checkpoint.completed == 5 and checkpoint.ahead == {6, 7}
+    checkpoint.done(5)
+    assert checkpoint.completed == 8 and not checkpoint.ahead
+    checkpoint.done(None)
+    assert checkpoint.finished == 3
+
+
+def test_without_a_file_done_only_counts():
+    checkpoint = Checkpoint(start=0, end=40)
+    for index in range(0, 40, 2):
+        checkpoint.done(index)
+    checkpoint.done(None)
+    assert not checkpoint.ahead
+    assert (checkpoint.finished, checkpoint.remaining) == (20, 20)
+
+
+def test_load_rejects_a_different_scan(tmp_path):
+    path = str(tmp_path / "scan.ckpt")
+    Checkpoint(path, "abc", end=3).save()
+    with pytest.raises(ValueError):
+        Checkpoint(path, "other", end=3).load()
+
+
+def test_pending_stops_at_the_shard_end():
+    checkpoint = Checkpoint(start=0, end=3)
+    assert list(checkpoint.pending(iter("abcdef"))) == [(0, "a"), (1, "b"), (2, "c")]
+
+
+@pytest.mark.parametrize("wordlists", [
+    [["a", "b", "c"]],
+    [["a", "b"], ["1", "2", "3"]],
+    [["a", "b"], ["1", "2", "3"], ["x", "y"]],
+])
+def test_resume_seeks_into_the_product(wordlists):
+    expected = list(itertools.product(*wordlists))
+    for start in range(len(expected) + 2):
+        assert list(iter_combinations(wordlists, start=start)) == expected[start:]
+
+
+def test_resume_seeks_into_compiled_wordlists(tmp_path):
+    source = tmp_path / "words.txt"
+    source.write_text("a\n\nb\nc\nb\n")
+    compile_wordlist(str(source), str(tmp_path / "words.fhw"))
+    compiled = CompiledWordlist(str(tmp_path / "words.fhw"))
+    try:
+        expected = list(itertools.product(["a", "b", "c"], ["1", "2"], ["a", "b", "c"]))
+        for start in range(len(expected) + 1):
+            assert list(iter_combinations([compiled, ["1", "2"], compiled], start=start)) == expected[start:]
+    finally:
+        compiled.close()
+
+
+def test_resume_seeks_pitchfork_line_by_line():
+    wordlists = [["a", "b", "c"], ["1", "2", "3", "4"]]
+    assert list(iter_combinations(wordlists, "pitchfork", start=1)) == [("b", "2"), ("c", "3")]
+
+
+def test_checkpoint_splits_name_the_process_counts_on_disk(tmp_path):
+    path = str(tmp_path / "scan.ckpt")
+    assert checkpoint_splits(path) == set()
+    for index in range(3):
+        Checkpoint(checkpoint_part(path, index, 3), "abc").save()
+    (tmp_path / "scan.ckpt.tmp").write_text("")
+    assert checkpoint_splits(path) == {3}
+    Checkpoint(path, "abc").save()
+    assert checkpoint_splits(path) == {1, 3}
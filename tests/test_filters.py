@@ -0,0 +1,56 @@
+import re
+
+import pytest
+
+from fuzzhound import ResponseFilter, ScanResponse
+
+
+def response(body, content_type="text/html; charset=utf-8"):
+    return ScanResponse("http://host/", 200, {"content-type": content_type}, body, len(body))
+
+
+def content_filter(pattern):
+    return ResponseFilter(include=ResponseFilter._compile(pattern, "--filter-content"))
+
+
+@pytest.mark.parametrize("pattern, text", [
+    ("a.b", "aéb"),
+    ("caf[^x]$", "café"),
+    ("^.{4}$", "café"),
+    ("k", "K"),
+    ("s", "ſ"),
+    ("admin", "ADMIN panel"),
+    ("x{3}", "abc"),
+])
+@pytest.mark.parametrize("charset", ["utf-8", "latin-1", "cp1254"])
+def test_content_filter_matches_like_text_search(pattern, text, charset):
+    try:
+        body = text.encode(charset)
+    except UnicodeEncodeError:
+        pytest.skip(f"{text!r} has no {charset} encoding")
+    expected = re.search(pattern, text, re.IGNORECASE) is not None
+    assert content_filter(pattern).matches(200, len(body), response(body, f"text/html; charset={charset}")) == expected
+
+
+def test_escapes_match_like_text_search_on_single_byte_charsets():
+    # \xe9 is é; ignoring case it also matches É, which bytes matching would not
+    body = "CAFÉ".encode("latin-1")
+    assert content_filter(r"caf\xe9").matches(200, len(body), response(body, "text/html; charset=latin-1"))
+    body = "İ".encode("cp1254")
+    assert content_filter("i").matches(200, len(body), response(body, "text/html; charset=cp1254"))
+
+
+def test_ascii_bodies_take_the_bytes_path_for_ascii_patterns():
+    include = ResponseFilter._compile("admin", "--filter-content")
+    assert include[1] is not None
+    assert ResponseFilter._compile(r"\w+", "--filter-content")[1] is None
+    assert content_filter("ADMIN").matches(200, 11, response(b"admin panel"))
+    assert not content_filter("root").matches(200, 11, response(b"admin panel"))
+
+
+def test_exclude_and_invalid_patterns():
+    exclude = ResponseFilter(exclude=ResponseFilter._compile("not found,oops", "--exclude-content"))
+    assert not exclude.matches(200, 9, response(b"Not Found"))
+    assert exclude.matches(200, 2, response(b"ok"))
+    with pytest.raises(ValueError):
+        ResponseFilter._compile("(", "--filter-content")
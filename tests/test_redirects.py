@@ -0,0 +1,19 @@
+from fuzzhound import hop_headers, next_hop
+
+HEADERS = {"Authorization": "Bearer secret", "cookie": "s=1", "Proxy-Authorization": "Basic x", "X-Keep": "yes"}
+
+
+def test_same_origin_hops_keep_credentials():
+    assert hop_headers(HEADERS, "http://a/x", "http://a/y/") == HEADERS
+    # requests also allows the http -> https upgrade on default ports
+    assert hop_headers(HEADERS, "http://a/x", "https://a/x") == HEADERS
+
+
+def test_cross_origin_hops_drop_credentials():
+    for target in ("http://b/x", "http://a:8080/x", "https://a:8443/x"):
+        assert hop_headers(HEADERS, "http://a/x", target) == {"X-Keep": "yes"}
+
+
+def test_next_hop_follows_redirect_method_rules():
+    assert next_hop("POST", "a=1", "http://a/x", 302, "/y") == ("GET", None, "http://a/y")
+    assert next_hop("POST", "a=1", "http://a/x", 307, "/y") == ("POST", "a=1", "http://a/y")
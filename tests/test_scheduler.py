@@ -0,0 +1,59 @@
+from fuzzhound import END_OF_PAYLOADS, HostScheduler, RequestTemplate, ScanJob
+
+
+def job(url):
+    return ScanJob(RequestTemplate(url))
+
+
+def entries(*words):
+    return list(enumerate(words))
+
+
+def drain(scheduler):
+    """Take every payload, finishing each probe straight away; returns (host, item) in order"""
+    order = []
+    for _, item, scan_job in scheduler.payloads():
+        order.append((scan_job.host, item))
+        scheduler.finish(scan_job)
+    return order
+
+
+def test_hosts_take_turns():
+    scheduler = HostScheduler()
+    scheduler.add(job("http://a/FUZZ"), entries("1", "2", "3"))
+    scheduler.add(job("http://b/FUZZ"), entries("x", "y"))
+    assert drain(scheduler) == [("a", "1"), ("b", "x"), ("a", "2"), ("b", "y"), ("a", "3")]
+
+
+def test_weight_gives_extra_turns():
+    scheduler = HostScheduler()
+    scheduler.add(job("http://a/FUZZ"), entries("1", "2", "3", "4"), weight=2)
+    scheduler.add(job("http://b/FUZZ"), entries("x", "y"))
+    assert [host for host, _ in drain(scheduler)] == ["a", "a", "b", "a", "a", "b"]
+
+
+def test_passes_on_one_host_run_in_priority_order():
+    scheduler = HostScheduler()
+    scheduler.add(job("http://a/deep/FUZZ"), entries("1"), priority=(2,))
+    scheduler.add(job("http://a/FUZZ"), entries("2"), priority=(1,))
+    assert [item for _, item in drain(scheduler)] == ["2", "1"]
+
+
+def test_capped_host_is_skipped_until_a_probe_finishes():
+    scheduler = HostScheduler(host_concurrency=1)
+    a, b = job("http://a/FUZZ"), job("http://b/FUZZ")
+    scheduler.add(a, entries("1", "2"))
+    scheduler.add(b, entries("x"))
+    with scheduler.lock:
+        assert scheduler._take()[1] == "1"
+        assert scheduler._take()[1] == "x"
+        # Both hosts are at their cap: wait for a probe rather than end the stream
+        assert scheduler._take() is None
+    scheduler.finish(a)
+    with scheduler.lock:
+        assert scheduler._take()[1] == "2"
+        assert scheduler._take() is None
+    scheduler.finish(a)
+    scheduler.finish(b)
+    with scheduler.lock:
+        assert scheduler._take() is END_OF_PAYLOADS
@@ -0,0 +1,46 @@
+import argparse
+
+import pytest
+
+from fuzzhound import count_lines, iter_wordlist, parse_shard, shard_bounds
+
+
+def test_parse_shard_is_zero_based():
+    assert parse_shard("3/8") == (2, 8)
+    assert parse_shard(" 1 / 1 ") == (0, 1)
+
+
+@pytest.mark.parametrize("value", ["0/4", "5/4", "1-4", "a/b", ""])
+def test_parse_shard_rejects_bad_values(value):
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_shard(value)
+
+
+@pytest.mark.parametrize("total", [0, 1, 3, 4, 10, 1001])
+@pytest.mark.parametrize("count", [1, 2, 3, 4, 7])
+def test_shards_cover_every_index_once(total, count):
+    bounds = [shard_bounds(total, [(index, count)]) for index in range(count)]
+    assert bounds[0][0] == 0 and bounds[-1][1] == total
+    assert all(end == start for (_, end), (start, _) in zip(bounds, bounds[1:]))
+    sizes = [end - start for start, end in bounds]
+    assert max(sizes) - min(sizes) <= 1
+
+
+def test_nested_splits_divide_the_parent_range():
+    # --shard 2/3 run with --processes 2 splits the second third again
+    parent = shard_bounds(30, [(1, 3)])
+    assert parent == (10, 20)
+    assert shard_bounds(30, [(1, 3), (0, 2)]) == (10, 15)
+    assert shard_bounds(30, [(1, 3), (1, 2)]) == (15, 20)
+
+
+def test_no_shards_owns_everything():
+    assert shard_bounds(42, []) == (0, 42)
+
+
+def test_shards_split_the_lines_the_scan_reads(tmp_path):
+    path = tmp_path / "words.txt"
+    path.write_text("a\n\nb\n  \nc\r\nd\n\n\n")
+    total = count_lines(str(path))
+    assert total == len(list(iter_wordlist(str(path)))) == 4
+    assert [shard_bounds(total, [(index, 4)]) for index in range(4)] == [(0, 1), (1, 2), (2, 3), (3, 4)]
@@ -0,0 +1,69 @@
+from fuzzhound import RequestTemplate, Segments
+
+
+def test_segments_render_numbered_slots():
+    segments = Segments("/FUZZ/x/FUZ2Z/FUZZ")
+    assert segments.render(("a", "b")) == "/a/x/b/a"
+    assert Segments("/static").render(("a",)) == "/static"
+
+
+def test_path_and_query_slots_are_encoded_differently():
+    template = RequestTemplate("http://host/FUZZ?q=FUZZ")
+    url, _, _, display = template.build("a b&c=d#", {})
+    assert url == "http://host/a%20b&c=d%23?q=a%20b%26c%3Dd%23"
+    assert display == "a b&c=d#"
+
+
+def test_path_payloads_keep_directories_and_pre_encoding():
+    url, _, _, _ = RequestTemplate("http://host/FUZZ").build("admin/users%2F1", {})
+    assert url == "http://host/admin/users%2F1"
+
+
+def test_target_without_keyword_fuzzes_the_last_segment():
+    template = RequestTemplate("http://host/api/")
+    assert template.target == "http://host/api/FUZZ"
+    assert template.path_slot
+    assert template.descend("v1").target == "http://host/api/v1/FUZZ"
+
+
+def test_multiple_wordlists_fill_their_own_slots():
+    template = RequestTemplate("http://host/FUZZ", data="name=wordlist_2&id=FUZ3Z")
+    assert template.wordlists_used == {0, 1, 2}
+    assert not template.path_slot
+    url, _, data, display = template.build(("a", "b", "c"), {})
+    assert (url, data, display) == ("http://host/a", "name=b&id=c", "a | b | c")
+
+
+def test_json_body_slots_are_escaped():
+    _, _, data, _ = RequestTemplate("http://host/login", data='{"user": "FUZZ"}').build('a"b\\', {})
+    assert data == '{"user": "a\\"b\\\\"}'
+
+
+def test_form_body_slots_are_encoded_only_for_form_content():
+    headers = {"Content-Type": "application/x-www-form-urlencoded"}
+    _, _, data, _ = RequestTemplate("http://host/login", headers, "user=FUZZ").build("a b&c", {})
+    assert data == "user=a+b%26c"
+    _, _, data, _ = RequestTemplate("http://host/login", {}, "user=FUZZ").build("a b&c", {})
+    assert data == "user=a b&c"
+
+
+def test_header_slots_cannot_inject_lines():
+    template = RequestTemplate("http://host/", {"X-Token": "t-FUZZ", "Accept": "*/*"})
+    assert template.headers == {"Accept": "*/*"}
+    _, headers, _, _ = template.build("a\r\nX-Evil: 1", template.headers)
+    assert headers == {"Accept": "*/*", "X-Token": "t-aX-Evil: 1"}
+
+
+def test_no_encode_sends_payloads_as_given():
+    template = RequestTemplate("http://host/FUZZ?q=FUZZ", {"X-A": "FUZZ"}, '{"a": "FUZZ"}', encode=False)
+    url, headers, data, _ = template.build('a b"', {})
+    assert url == 'http://host/a b"?q=a b"'
+    assert headers["X-A"] == 'a b"'
+    assert data == '{"a": "a b""}'
+
+
+def test_slot_numbers_start_at_one():
+    template = RequestTemplate("http://host/FUZ0Z/FUZ2Z", data="id=wordlist_0&n=FUZ01Z")
+    assert template.wordlists_used == {1}
+    url, _, data, _ = template.build(("a", "b"), {})
+    assert (url, data) == ("http://host/FUZ0Z/b", "id=wordlist_0&n=FUZ01Z")